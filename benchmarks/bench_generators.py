@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Terraform code generators
+
+Runs each generator against a temporary directory, with synthetic fleets
+of 10/100/1,000/10,000 environments for the environment-driven generators,
+and reports files/sec, render vs write time and peak memory. Every case
+runs twice: a cold pass into an empty tree and a warm pass over the tree
+the cold pass left behind.
+
+With --memory the generated files go to an in-memory sink instead, so
+render throughput is measured without any output I/O; the warm pass then
+re-renders everything and finds it unchanged.
+
+Each case runs in its own subprocess so peak RSS is measured per case.
+Results can be saved as a baseline and later runs compared against it:
+
+    python3 benchmarks/bench_generators.py --save-baseline
+    python3 benchmarks/bench_generators.py --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from tfgen import generators, run
+from tfgen.environments import resolve_rows
+from tfgen.inventory import read_environments
+from tfgen.sinks import MemorySink
+
+BASELINE = os.path.join(REPO_DIR, "benchmarks", "baseline.json")
+
+# Benchmarked generators, by their name in the tfgen.generators registry
+GENERATORS = ["layers", "modules", "configs", "env-files", "readmes"]
+FLEET_SIZES = [10, 100, 1000, 10000]
+INSTANCE_SIZES = [("t3.small", "db.t3.small"), ("t3.medium", "db.t3.medium"), ("t3.large", "db.r5.large")]
+
+# A case regresses when its files/sec drops by more than this fraction;
+# cases that took less than MIN_COMPARE_SECONDS in the baseline are too noisy
+DEFAULT_THRESHOLD = 0.25
+MIN_COMPARE_SECONDS = 0.1
+
+
+def write_fleet(path, size):
+    """Write a synthetic NDJSON inventory of `size` environments"""
+    with open(path, "w") as f:
+        for i in range(size):
+            instance, rds = INSTANCE_SIZES[i % len(INSTANCE_SIZES)]
+            row = {
+                "name": f"env{i:05d}",
+                "vpc_cidr": f"10.{i // 256 % 256}.{i % 256}.0/24",
+                "azs": ["us-east-1a", "us-east-1b", "us-east-1c"],
+                "single_nat": i % 2 == 0,
+                "retention": 7 * (1 + i % 4),
+                "instance_size": instance,
+                "rds_instance": rds,
+                "multi_az": i % 2 == 1,
+            }
+            f.write(json.dumps(row) + "\n")
+
+
+def run_case(name, fleet, jobs, memory=False):
+    """Run one generator case in this process and return its measurements"""
+    module = generators.load(name)
+    results = []
+    sink = MemorySink() if memory else None
+    with tempfile.TemporaryDirectory(prefix="tfgen-bench-") as tmp:
+        base_dir = None if memory else os.path.join(tmp, "repo")
+        inventory = os.path.join(tmp, "fleet.ndjson")
+        if fleet:
+            write_fleet(inventory, fleet)
+
+        for phase in ("cold", "warm"):
+            targets = module.targets(resolve_rows(read_environments(inventory))) if fleet else module.targets()
+            start = time.perf_counter()
+            stats = run(targets, base_dir, jobs=jobs, sink=sink)
+            wall = time.perf_counter() - start
+            results.append({
+                "generator": name,
+                "fleet": fleet,
+                "phase": phase,
+                "sink": "memory" if memory else "disk",
+                "files": stats.total,
+                "written": stats.created + stats.written,
+                "wall_seconds": round(wall, 4),
+                "files_per_second": round(stats.total / wall, 1) if wall else None,
+                "render_seconds": round(stats.render_seconds, 4),
+                "write_seconds": round(stats.write_seconds, 4),
+            })
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for result in results:
+        result["peak_rss_kb"] = peak_kb
+    return results
+
+
+def case_key(result):
+    key = f"{result['generator']}/{result['fleet'] or '-'}/{result['phase']}"
+    return f"{key}/memory" if result.get("sink") == "memory" else key
+
+
+def run_suite(names, sizes, jobs, memory=False):
+    """Run every case in a fresh subprocess and collect the results"""
+    results = []
+    for name in names:
+        for fleet in (sizes if generators.load(name).INVENTORY else [0]):
+            cmd = [sys.executable, os.path.abspath(__file__), "--case", name, str(fleet), "--jobs", str(jobs)]
+            if memory:
+                cmd.append("--memory")
+            out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+            for result in json.loads(out):
+                results.append(result)
+                print_result(result)
+    return results
+
+
+def print_result(result):
+    print(
+        f"  {case_key(result):<36} {result['files']:>7} files "
+        f"{result['files_per_second'] or 0:>10.0f} files/s  "
+        f"render {result['render_seconds']:>7.3f}s  write {result['write_seconds']:>7.3f}s  "
+        f"peak {result['peak_rss_kb'] / 1024:>6.1f} MiB"
+    )
+
+
+def compare(results, baseline, threshold):
+    """Print regressions against the baseline and return how many there were"""
+    previous = {case_key(r): r for r in baseline["results"]}
+    regressions = 0
+    for result in results:
+        before = previous.get(case_key(result))
+        if not before or before["wall_seconds"] < MIN_COMPARE_SECONDS or not result["files_per_second"]:
+            continue
+        change = result["files_per_second"] / before["files_per_second"] - 1
+        if change < -threshold:
+            regressions += 1
+            print(f"  ❌ {case_key(result)}: {change:+.0%} files/s "
+                  f"({before['files_per_second']:.0f} -> {result['files_per_second']:.0f})")
+    return regressions
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--generator", action="append", choices=sorted(GENERATORS),
+                   help="generator to benchmark (repeatable, default: all)")
+    p.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=FLEET_SIZES,
+                   help="comma-separated fleet sizes (default: 10,100,1000,10000)")
+    p.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--memory", action="store_true", help="generate into an in-memory sink instead of a temp dir")
+    p.add_argument("--output", metavar="FILE", help="write the results as JSON")
+    p.add_argument("--baseline", default=BASELINE, help=f"baseline file (default: {BASELINE})")
+    p.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    p.add_argument("--compare", action="store_true", help="fail if files/sec regressed against the baseline")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                   help=f"allowed files/sec drop before a case counts as a regression (default: {DEFAULT_THRESHOLD})")
+    p.add_argument("--case", nargs=2, metavar=("GENERATOR", "FLEET"), help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.case:
+        name, fleet = args.case
+        print(json.dumps(run_case(name, int(fleet), args.jobs, args.memory)))
+        return 0
+
+    print(f"🚀 Benchmarking generators (jobs={args.jobs})...")
+    results = run_suite(args.generator or list(GENERATORS), args.sizes, args.jobs, args.memory)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "jobs": args.jobs,
+        "results": results,
+    }
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\n📄 Results saved: {path}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} case(s) regressed against {args.baseline}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Script to generate remaining Terraform structure
-BASE_DIR="/Users/diego/terraform-aws-enterprise"
+BASE_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 # Create backend.conf and terraform.tfvars for all layers and environments
 LAYERS=("compute" "database" "storage" "security" "dns" "monitoring")
@@ -23,4 +23,7 @@ variable "health_checks" {
   }))
   default = {}
 }
-variable "tags" { type = map(string); default = {} }
+variable "tags" {
+  type    = map(string)
+  default = {}
+}
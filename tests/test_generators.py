@@ -0,0 +1,166 @@
+"""
+Tests for the tfgen render engine and generators
+
+The environment-driven generators run over a synthetic fleet into an
+in-memory sink, so nothing is written to the checkout:
+
+    python3 -m pytest -q tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from tfgen import generators, run
+from tfgen.engine import Target
+from tfgen.environments import resolve_rows
+from tfgen.fmt import format_hcl
+from tfgen.inventory import read_environments
+from tfgen.manifest import Manifest
+from tfgen.sinks import MemorySink
+from tfgen.validate import ValidationError
+
+FLEET_SIZE = 24
+TIERS = ["nonprod", "prod"]
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    """Path of a synthetic NDJSON inventory of FLEET_SIZE environments"""
+    path = tmp_path / "fleet.ndjson"
+    with open(path, "w") as f:
+        for i in range(FLEET_SIZE):
+            row = {
+                "name": f"env{i:03d}",
+                "tier": TIERS[i % len(TIERS)],
+                "vpc_cidr": f"10.{i}.0.0/16",
+                "azs": ["us-east-1a", "us-east-1b"],
+                "retention": 7 * (1 + i % 4),
+            }
+            f.write(json.dumps(row) + "\n")
+    return str(path)
+
+
+def fleet(inventory):
+    return resolve_rows(read_environments(inventory))
+
+
+def render(name, inventory, jobs=1, **kwargs):
+    sink = MemorySink()
+    stats = run(generators.load(name).targets(fleet(inventory), **kwargs), None, jobs=jobs, sink=sink)
+    return sink, stats
+
+
+@pytest.mark.parametrize("name", ["configs", "env-files"])
+def test_parallel_output_matches_serial(name, inventory):
+    serial, stats = render(name, inventory, jobs=1)
+    parallel, _ = render(name, inventory, jobs=4)
+    templates = generators.load(name).TEMPLATES
+    assert stats.created == FLEET_SIZE * len(generators.ENVIRONMENT_LAYERS) * len(templates)
+    assert parallel.files == serial.files
+
+
+def test_unchanged_files_are_skipped(inventory):
+    module = generators.load("configs")
+    sink = MemorySink()
+    first = run(module.targets(fleet(inventory)), None, sink=sink)
+    second = run(module.targets(fleet(inventory)), None, sink=sink)
+    assert second.skipped == first.created == first.total
+    assert second.created == second.written == 0
+
+
+def test_second_run_is_cached_by_manifest(inventory, tmp_path):
+    base_dir = str(tmp_path / "repo")
+    module = generators.load("configs")
+    first = run(module.targets(fleet(inventory)), base_dir, manifest=Manifest(base_dir))
+    second = run(module.targets(fleet(inventory)), base_dir, manifest=Manifest(base_dir))
+    assert first.created == first.total > 0
+    assert second.cached == second.total == first.total
+
+
+def test_filters_select_matching_files(inventory):
+    sink, _ = render("configs", inventory, envs=["env00*"], layers=["dns"])
+    expected = {
+        f"layers/dns/environments/env{i:03d}/{filename}"
+        for i in range(10)
+        for filename in generators.load("configs").TEMPLATES
+    }
+    assert set(sink.files) == expected
+
+
+def test_filters_select_layers():
+    targets = list(generators.load("layers").targets(layers=["dns", "comp*"]))
+    layers = {target.path.split("/")[1] for target in targets}
+    assert targets and layers == {"dns", "compute"}
+
+
+def verbatim(text):
+    return text
+
+
+def test_validation_errors_are_reported():
+    sink = MemorySink()
+    targets = [
+        Target("layers/dns/good.tf", verbatim, ("a = 1\n",)),
+        Target("layers/dns/bad.tf", verbatim, ("a = \n",)),
+    ]
+    with pytest.raises(ValidationError) as e:
+        run(targets, None, sink=sink)
+    assert len(e.value.errors) == 1
+    assert e.value.errors[0].startswith("layers/dns/bad.tf:1:")
+    assert sink.files == {}
+
+
+HCL = '''\
+resource "aws_s3_bucket" "logs" {
+bucket = "logs"
+  force_destroy = true
+  # comment
+  tags = {
+    Name = "logs"
+    Environment = var.environment
+  }
+
+  policy = <<EOT
+{"a": 1}
+EOT
+  longer_name = 2
+  b = 3
+}
+'''
+
+FORMATTED = '''\
+resource "aws_s3_bucket" "logs" {
+  bucket        = "logs"
+  force_destroy = true
+  # comment
+  tags = {
+    Name        = "logs"
+    Environment = var.environment
+  }
+
+  policy = <<EOT
+{"a": 1}
+EOT
+  longer_name = 2
+  b           = 3
+}
+'''
+
+
+def test_format_aligns_arguments():
+    assert format_hcl(HCL) == FORMATTED
+
+
+def test_format_is_idempotent(inventory):
+    assert format_hcl(FORMATTED) == FORMATTED
+    sink, _ = render("env-files", inventory, envs=["env000"])
+    for path, data in sink.files.items():
+        if path.endswith((".tf", ".tfvars")):
+            text = format_hcl(data.decode("utf-8"))
+            assert format_hcl(text) == text, path
@@ -0,0 +1,13 @@
+"""
+Terraform drift detection for the layer x environment matrix
+
+    python3 -m tfdrift check [LAYER] [ENVIRONMENT]
+
+plans every layers/<layer>/environments/<env> directory on a pool of
+workers; scripts/drift-detection.sh and the make drift-* targets are
+shortcuts for it.
+"""
+
+from tfdrift.runner import Result, Target, check, run
+
+__all__ = ["Result", "Target", "check", "run"]
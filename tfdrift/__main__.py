@@ -0,0 +1,7 @@
+"""python3 -m tfdrift: detect drift between Terraform state and AWS"""
+
+import sys
+
+from tfdrift.cli import main
+
+sys.exit(main())
@@ -0,0 +1,468 @@
+"""
+Command line of the drift detection runner
+
+    python3 -m tfdrift check [LAYER] [ENVIRONMENT] [options]
+
+checks LAYER (default: all) in ENVIRONMENT (default: all) for drift and
+exits 0 when nothing drifted, 2 when something did and 1 on errors, like
+scripts/drift-detection.sh always has. Every check and the resources it
+found changed are recorded in drift-reports/drift.db;
+
+    python3 -m tfdrift query [--env ENV] [--since 30d] [--by address]
+
+lists the resources that drifted most often and
+
+    python3 -m tfdrift report [--show REPORT]
+
+the latest drift reports, from the same index (see tfdrift.reports).
+
+    python3 -m tfdrift fix LAYER ENVIRONMENT
+
+applies the plan the last check saved for a drifted target, or plans
+and applies afresh if the target's state or config moved since (see
+tfdrift.plans).
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+from tfdrift import plans, runner
+from tfdrift.fingerprint import Fingerprints
+from tfdrift.reports import DEFAULT_RETENTION_DAYS, ReportStore, compact, is_digest
+from tfdrift.store import DB_FILE, GROUPS, DriftStore, timestamp
+from tfdrift.runner import CANCELLED, CHECKED, DRIFT, ERROR, FAILED, NO_DRIFT, SKIPPED, TIMEOUT, UNCHANGED, Target
+from tfgen.environments import load_environments
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = "drift-reports"
+
+LAYERS = ("security", "networking", "storage", "database", "monitoring", "compute")
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+BLUE = "\033[0;34m"
+NC = "\033[0m"
+
+RULE = "  " + "─" * 61
+BAR = "═" * 63
+
+_CHANGE = re.compile(r"^  [~+-]")
+_SINCE = re.compile(r"^(\d+)([hdw])$")
+
+# Plan symbols of change record actions
+SYMBOLS = {"create": "+", "update": "~", "delete": "-", "replace": "-/+", "read": "<="}
+
+
+def environments():
+    """Environment names, in the order environments.toml defines them"""
+    return [name for name, _ in load_environments()]
+
+
+def parser():
+    p = argparse.ArgumentParser(prog="python3 -m tfdrift", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = p.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    c = commands.add_parser("check", help="plan layer/environment directories and report drift")
+    c.add_argument("layer", nargs="?", default="all", help="layer to check (default: all)")
+    c.add_argument("environment", nargs="?", default="all", help="environment to check (default: all)")
+    c.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=runner.DEFAULT_JOBS,
+        help=f"targets planned at the same time (default: {runner.DEFAULT_JOBS})",
+    )
+    c.add_argument(
+        "--timeout",
+        type=float,
+        default=runner.DEFAULT_TIMEOUT,
+        metavar="SECONDS",
+        help=f"stop a target's terraform after this long and count it as an error "
+             f"(default: {runner.DEFAULT_TIMEOUT}, 0 for none)",
+    )
+    c.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="skip targets whose config, lock file and state serial are unchanged since their last clean check "
+             "(by default they get a refresh-only plan)",
+    )
+    c.add_argument(
+        "--full",
+        action="store_true",
+        help="run a full plan on every target, whatever its fingerprint",
+    )
+    c.add_argument(
+        "--ndjson",
+        metavar="FILE",
+        help="also write one JSON record per drifted or changing resource to FILE",
+    )
+    c.add_argument(
+        "--retention",
+        type=int,
+        default=DEFAULT_RETENTION_DAYS,
+        metavar="DAYS",
+        help=f"drop drift history and reports older than DAYS after the run "
+             f"(default: {DEFAULT_RETENTION_DAYS}, 0 to keep everything)",
+    )
+    c.add_argument("--base-dir", default=BASE_DIR, help="repository root (default: %(default)s)")
+
+    r = commands.add_parser("report", help="list the latest drift reports, or print one")
+    r.add_argument("--env", help="only this environment")
+    r.add_argument("--layer", help="only this layer")
+    r.add_argument("--limit", type=int, default=10, help="reports to list (default: 10)")
+    r.add_argument("--show", metavar="REPORT",
+                   help="print a report: a digest (or its prefix) or LAYER/ENV for the latest one")
+    r.add_argument("--compact", action="store_true",
+                   help="apply the retention policy (see --retention) and import old plain-text reports")
+    r.add_argument("--retention", type=int, default=DEFAULT_RETENTION_DAYS, metavar="DAYS",
+                   help=f"with --compact, days of history to keep (default: {DEFAULT_RETENTION_DAYS})")
+    r.add_argument("--base-dir", default=BASE_DIR, help="repository root (default: %(default)s)")
+
+    f = commands.add_parser("fix", help="apply the plan saved by the last drift check, re-planning if it is stale")
+    f.add_argument("layer", help="layer to fix")
+    f.add_argument("environment", help="environment to fix")
+    f.add_argument("--replan", action="store_true", help="ignore the saved plan and plan afresh")
+    f.add_argument(
+        "--max-age",
+        type=float,
+        default=plans.MAX_AGE / 3600,
+        metavar="HOURS",
+        help=f"re-plan if the saved plan is older than this (default: {plans.MAX_AGE // 3600})",
+    )
+    f.add_argument("--base-dir", default=BASE_DIR, help="repository root (default: %(default)s)")
+
+    q = commands.add_parser("query", help="list the resources that drifted most from drift-reports/drift.db")
+    q.add_argument("--env", help="only this environment")
+    q.add_argument("--layer", help="only this layer")
+    q.add_argument("--since", metavar="AGE", help="only changes from the last AGE (e.g. 12h, 30d, 4w) "
+                                                  "or since an ISO date (e.g. 2024-10-01)")
+    q.add_argument("--kind", choices=("drift", "change"),
+                   help="only changes made outside Terraform (drift) or planned actions (change)")
+    q.add_argument("--by", choices=GROUPS, default="address", help="what to count changes by (default: address)")
+    q.add_argument("--limit", type=int, default=20, help="rows to show (default: 20)")
+    q.add_argument("--ndjson", action="store_true", help="print every matching change as NDJSON instead")
+    q.add_argument("--base-dir", default=BASE_DIR, help="repository root (default: %(default)s)")
+    return p
+
+
+def _header():
+    print()
+    print("╔═══════════════════════════════════════════════════════════════╗")
+    print("║                                                                ║")
+    print("║           Terraform Drift Detection                            ║")
+    print("║                                                                ║")
+    print("╚═══════════════════════════════════════════════════════════════╝")
+    print()
+
+
+def _lines(text, limit):
+    return [f"  {line}" if line else "" for line in text.splitlines()[:limit]]
+
+
+def _structured_summary(changes):
+    """Action counts and the changed resources of a result's change records"""
+    counts = {}
+    for record in changes:
+        key = (record["kind"], record["action"])
+        counts[key] = counts.get(key, 0) + 1
+    planned = ", ".join(f"{n} to {verb}" for (kind, verb), n in sorted(counts.items()) if kind == "change")
+    drifted = sum(n for (kind, _), n in counts.items() if kind == "drift")
+    summary = []
+    if drifted:
+        summary.append(f"  {drifted} resource(s) changed outside of Terraform")
+    if planned:
+        summary.append(f"  Plan: {planned}")
+    lines = []
+    for record in changes[:20]:
+        attributes = f" ({', '.join(record['attributes'])})" if record["attributes"] else ""
+        origin = " [changed outside Terraform]" if record["kind"] == "drift" else ""
+        lines.append(f"  {SYMBOLS.get(record['action'], '?'):>3} {record['address']}{attributes}{origin}")
+    if len(changes) > 20:
+        lines.append(f"  ... and {len(changes) - 20} more")
+    return summary, lines
+
+
+def _drift_summary(output):
+    """The 'Terraform will perform' lines and the changed resources of a plan's text"""
+    lines = output.splitlines()
+    summary = []
+    for i, line in enumerate(lines):
+        if "Terraform will perform" in line:
+            summary.extend(lines[i:i + 3])
+    changes = [line for line in lines if _CHANGE.match(line)][:20]
+    return summary, changes
+
+
+def format_result(result, base_dir):
+    """The block of text reporting one Result"""
+    out = [
+        "",
+        f"{BLUE}{BAR}{NC}",
+        f"{BLUE}  Checking: {result.target}{NC}",
+        f"{BLUE}{BAR}{NC}",
+    ]
+    status = result.status
+    took = f" ({result.seconds:.0f}s)" if status in CHECKED else ""
+    if status == SKIPPED:
+        out.append(f"{YELLOW}⚠ Skipped{NC}: {result.message}")
+    elif status == UNCHANGED:
+        out.append(f"{GREEN}  ✓ Unchanged{NC}: {result.message}")
+    elif status == CANCELLED:
+        out.append(f"{YELLOW}  ⚠ Cancelled{NC}")
+    elif status == NO_DRIFT:
+        out.append(f"{GREEN}  ✓ No Drift{NC}: {result.message}{took}")
+    elif status in FAILED:
+        if status == TIMEOUT:
+            out.append(f"{RED}  ✗ Timed Out{NC}: {result.message}")
+        else:
+            label = "Failed" if result.message.startswith("Terraform init") else "Error"
+            out.append(f"{RED}  ✗ {label}{NC}: {result.message}{took}")
+        if result.output:
+            out += ["", "  Error Details:", RULE, *_lines(result.output, 30), RULE]
+    elif status == DRIFT:
+        if result.changes:
+            summary, changes = _structured_summary(result.changes)
+        else:
+            summary, changes = _drift_summary(result.output)
+        out += [f"{YELLOW}  ⚠ Drift Detected{NC}: {result.message}{took}", "", "  Drift Summary:", RULE]
+        out += summary or ["  See plan output for details"]
+        out += [RULE, "", "  Changed Resources:", RULE]
+        out += changes or ["  See full plan for details"]
+        out.append(RULE)
+        if result.report:
+            path = ReportStore(os.path.join(base_dir, REPORTS_DIR)).path(result.report)
+            out += ["", f"{YELLOW}  📄 Drift report saved: {os.path.relpath(path, base_dir)}{NC}"]
+    return "\n".join(out)
+
+
+def check(args):
+    envs = environments()
+    if args.layer != "all" and args.layer not in LAYERS:
+        print(f"{RED}Error:{NC} Invalid layer: {args.layer}")
+        print(f"Valid layers: {' '.join(LAYERS)} or 'all'")
+        return 1
+    if args.environment != "all" and args.environment not in envs:
+        print(f"{RED}Error:{NC} Invalid environment: {args.environment}")
+        print(f"Valid environments: {' '.join(envs)} or 'all'")
+        return 1
+
+    layers = LAYERS if args.layer == "all" else [args.layer]
+    envs = envs if args.environment == "all" else [args.environment]
+    targets = [Target(layer, env) for layer in layers for env in envs]
+    print("Drift Detection Scope:")
+    print(f"  Layers:       {' '.join(layers)}")
+    print(f"  Environments: {' '.join(envs)}")
+    print(f"  Total Checks: {len(targets)}")
+    print(f"  Workers:      {min(args.jobs, len(targets))}")
+    print()
+
+    start = time.monotonic()
+    reports_dir = os.path.join(args.base_dir, REPORTS_DIR)
+    cancel = threading.Event()
+    counts = dict.fromkeys((NO_DRIFT, DRIFT, ERROR, TIMEOUT, UNCHANGED, SKIPPED, CANCELLED), 0)
+    fingerprints = Fingerprints.load(args.base_dir, full=args.full)
+    store = DriftStore(os.path.join(reports_dir, DB_FILE))
+    ndjson = open(args.ndjson, "w") if args.ndjson else None
+    results = runner.run(targets, args.base_dir, reports_dir, args.jobs, args.timeout or None, cancel,
+                         fingerprints, args.skip_unchanged)
+    try:
+        for result in results:
+            counts[result.status] += 1
+            # Printed and stored from this thread only, so concurrent checks never interleave
+            print(format_result(result, args.base_dir), flush=True)
+            if result.status in (SKIPPED, CANCELLED):
+                continue
+            checked_at = timestamp()
+            store.add(result, checked_at)
+            if ndjson is not None:
+                for record in result.changes:
+                    line = {"checked_at": checked_at, "layer": result.target.layer, "env": result.target.env, **record}
+                    ndjson.write(json.dumps(line) + "\n")
+        compact(store, ReportStore(reports_dir), args.retention)
+    finally:
+        fingerprints.save()
+        store.close()
+        if ndjson is not None:
+            ndjson.close()
+    duration = time.monotonic() - start
+
+    checked = sum(counts[status] for status in CHECKED)
+    drifted = counts[DRIFT]
+    errors = sum(counts[status] for status in FAILED)
+    print()
+    print("╔═══════════════════════════════════════════════════════════════╗")
+    print("║                      DRIFT DETECTION SUMMARY                   ║")
+    print("╚═══════════════════════════════════════════════════════════════╝")
+    print()
+    print(f"  Layers Checked:    {checked}")
+    print(f"  Drift Detected:    {drifted}")
+    print(f"  Errors:            {errors}")
+    if counts[UNCHANGED]:
+        print(f"  Unchanged:         {counts[UNCHANGED]} (not planned)")
+    if counts[TIMEOUT]:
+        print(f"  Timed Out:         {counts[TIMEOUT]}")
+    if counts[CANCELLED]:
+        print(f"  Cancelled:         {counts[CANCELLED]}")
+    print(f"  Duration:          {duration:.0f}s")
+    print()
+
+    if cancel.is_set():
+        print(f"{YELLOW}⚠ CANCELLED{NC}: {counts[CANCELLED]} check(s) did not complete.")
+        print()
+        return 130
+    if drifted == 0 and errors == 0:
+        print(f"{GREEN}✓ SUCCESS{NC}: No drift detected. All infrastructure matches Terraform state.")
+        print()
+        return 0
+    if errors:
+        print(f"{RED}✗ ERRORS{NC}: {errors} error(s) occurred during drift detection.")
+        print()
+        print("Review the error output above and fix any Terraform configuration issues.")
+        print()
+        return 1
+    print(f"{YELLOW}⚠ DRIFT DETECTED{NC}: {drifted} layer(s) have infrastructure drift.")
+    print()
+    print("Next Steps:")
+    print("  1. Review drift reports: make drift-report")
+    print("  2. Investigate what changed (check CloudTrail)")
+    print("  3. Decide: Update Terraform OR revert AWS changes")
+    print(f"  4. Document resolution in: {REPORTS_DIR}/CHANGELOG.md")
+    print("  5. Run drift detection again to verify")
+    print()
+    print("Quick fixes:")
+    print("  • Update Terraform: Edit .tf/.tfvars, commit, push")
+    print("  • Revert AWS:       make drift-fix LAYER=x ENV=y (applies the plan saved by this check)")
+    print()
+    return 2
+
+
+def _since(value):
+    """checked_at lower bound of --since: an age like 30d, or a date as given"""
+    m = _SINCE.match(value)
+    if m is None:
+        return value
+    seconds = int(m.group(1)) * {"h": 3600, "d": 86400, "w": 7 * 86400}[m.group(2)]
+    return timestamp(time.time() - seconds)
+
+
+def query(args):
+    path = os.path.join(args.base_dir, REPORTS_DIR, DB_FILE)
+    if not os.path.exists(path):
+        print(f"No drift history yet ({os.path.relpath(path)} does not exist)")
+        return 0
+    store = DriftStore(path)
+    filters = {"env": args.env, "layer": args.layer, "kind": args.kind,
+               "since": _since(args.since) if args.since else None}
+    try:
+        if args.ndjson:
+            for record in store.changes(**filters):
+                print(json.dumps(record))
+            return 0
+        rows = store.top(args.by, args.limit, **filters)
+    finally:
+        store.close()
+    if not rows:
+        print("No changes recorded")
+        return 0
+    width = max(len(args.by), *(len(str(value)) for value, _, _ in rows))
+    print(f"{args.by:<{width}}  {'times':>5}  last seen")
+    for value, times, last in rows:
+        print(f"{value:<{width}}  {times:>5}  {last}")
+    return 0
+
+
+def report(args):
+    reports_dir = os.path.join(args.base_dir, REPORTS_DIR)
+    reports = ReportStore(reports_dir)
+    store = DriftStore(os.path.join(reports_dir, DB_FILE))
+    try:
+        if args.compact:
+            dropped, removed = compact(store, reports, args.retention)
+            print(f"🧹 Dropped {dropped} check(s) of history and {removed} report(s) no longer referenced")
+            return 0
+        if args.show:
+            return _show(store, reports, args.show)
+        rows = store.reports(args.limit, env=args.env, layer=args.layer)
+    finally:
+        store.close()
+
+    print("📊 Drift Detection Reports:")
+    print()
+    if not rows:
+        print("  No drift reports found")
+    for checked_at, layer, env, digest in rows:
+        print(f"  {checked_at}  {layer + '/' + env:<24}  {digest[:12]}")
+    if rows:
+        print()
+        print(f"  {len(set(reports.digests()))} distinct report(s), {reports.size() / 1024:.1f} KiB compressed")
+        print("  Show one: python3 -m tfdrift report --show DIGEST (or LAYER/ENV)")
+    print()
+    print(f"View changelog: cat {REPORTS_DIR}/CHANGELOG.md")
+    return 0
+
+
+def _show(store, reports, wanted):
+    """Print the report named by a digest prefix or LAYER/ENV"""
+    if "/" in wanted:
+        layer, _, env = wanted.partition("/")
+        rows = store.reports(1, env=env, layer=layer)
+        digests = [rows[0][3]] if rows else []
+    else:
+        digests = sorted({digest for digest in store.referenced() if is_digest(digest) and digest.startswith(wanted)})
+    if len(digests) != 1:
+        print(f"No report matches {wanted!r}" if not digests else f"{wanted!r} matches {len(digests)} reports")
+        return 1
+    print(reports.read(digests[0]), end="")
+    return 0
+
+
+def fix(args):
+    target = Target(args.layer, args.environment)
+    directory = os.path.join(args.base_dir, target.path)
+    if not os.path.isdir(directory):
+        print(f"{RED}Error:{NC} {target.path} not found")
+        return 1
+
+    meta = plans.load(directory)
+    if args.replan:
+        reason = "--replan given"
+    else:
+        fingerprint = None
+        if meta is not None:
+            _, _, serial = runner.state_serial(directory)
+            if serial is not None:
+                fingerprint = Fingerprints(args.base_dir).fingerprint(directory, *serial)
+        reason = plans.stale(meta, fingerprint, args.max_age * 3600)
+
+    if reason is None:
+        print(f"  Applying the plan saved by the drift check at {meta['planned_at']} (state serial {meta['serial']})")
+        command = ["terraform", "apply", "-input=false", plans.PLAN_FILE]
+    else:
+        print(f"  Planning afresh: {reason}")
+        command = ["terraform", "apply", "-auto-approve"]
+    code = subprocess.run(command, cwd=directory).returncode
+    if code == 0:
+        plans.discard(directory)
+    return code
+
+
+def main(argv=None):
+    """Run a drift command from the command line and return the exit status"""
+    p = parser()
+    args = p.parse_args(argv)
+    if args.command == "query":
+        return query(args)
+    if args.command == "report":
+        return report(args)
+    if args.command == "fix":
+        return fix(args)
+    if args.jobs < 1:
+        p.error("--jobs must be at least 1")
+    _header()
+    return check(args)
@@ -0,0 +1,162 @@
+"""
+Fingerprints of drift-checked targets (.tfgen-cache/drift.json)
+
+A target's fingerprint is everything on our side that a plan depends on:
+
+    config    the target directory's Terraform files, its layer's, and
+              every local module they call (recursively)
+    lock      the provider lock file, .terraform.lock.hcl
+    serial    the remote state's serial and lineage
+
+After a clean check (no drift) the fingerprint is stored. Next time, a
+target whose fingerprint is unchanged cannot differ from its
+configuration except through changes made outside Terraform, so a
+refresh-only plan is enough to detect drift; with --skip-unchanged the
+target is not checked at all. A target that drifted or failed has its
+fingerprint dropped and gets a full plan until it is clean again.
+
+Directory digests are computed once per run, so the modules and layer
+files shared by many targets are only read once.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from tfgen.validate import CACHE_DIR
+
+FINGERPRINT_FILE = "drift.json"
+# Bump when fingerprints change meaning, so stored ones are dropped
+VERSION = 1
+LOCK_FILE = ".terraform.lock.hcl"
+CONFIG_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json", ".conf")
+
+# Local module sources: ./x, ../x
+_SOURCE = re.compile(r'^\s*source\s*=\s*"(\.{1,2}/[^"]*)"', re.MULTILINE)
+# Module name of a local source pointing into a modules/ directory
+_MODULE = re.compile(r"(?:^|/)modules/([A-Za-z0-9_-]+)/?$")
+
+
+class Fingerprints:
+    """Stored fingerprints of clean targets, by target path
+
+    With full, no target counts as unchanged, but clean checks are still
+    recorded.
+    """
+
+    def __init__(self, base_dir, full=False):
+        self.base_dir = base_dir
+        self.full = full
+        self.path = os.path.join(base_dir, CACHE_DIR, FINGERPRINT_FILE)
+        self._entries = {}
+        self._digests = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, base_dir, full=False):
+        fingerprints = cls(base_dir, full)
+        try:
+            with open(fingerprints.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        if data.get("version") == VERSION:
+            fingerprints._entries = data.get("targets", {})
+        return fingerprints
+
+    def _directory_digest(self, directory):
+        """(digest, local module dirs) of the config files directly in directory"""
+        with self._lock:
+            cached = self._digests.get(directory)
+        if cached is not None:
+            return cached
+        h = hashlib.sha256()
+        modules = []
+        try:
+            names = sorted(entry.name for entry in os.scandir(directory) if entry.is_file())
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith(CONFIG_SUFFIXES):
+                continue
+            with open(os.path.join(directory, name), "rb") as f:
+                data = f.read()
+            h.update(f"{name}\0{len(data)}\0".encode("utf-8"))
+            h.update(data)
+            if name.endswith(".tf"):
+                for source in _SOURCE.findall(data.decode("utf-8", "replace")):
+                    modules.append(self._module_dir(directory, source))
+        cached = (h.hexdigest(), sorted({module for module in modules if module}))
+        with self._lock:
+            self._digests[directory] = cached
+        return cached
+
+    def _module_dir(self, directory, source):
+        path = os.path.normpath(os.path.join(directory, source))
+        if os.path.isdir(path):
+            return path
+        # Layers call modules by a path relative to the layer directory; like
+        # the module index, fall back to <base_dir>/modules/<name>
+        m = _MODULE.search(source)
+        path = m and os.path.join(self.base_dir, "modules", m.group(1))
+        return path if path and os.path.isdir(path) else None
+
+    def config_digest(self, directory):
+        """Digest of directory's config, its layer's and every local module called"""
+        h = hashlib.sha256()
+        layer_dir = os.path.dirname(os.path.dirname(directory))
+        pending = [directory, layer_dir]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            digest, modules = self._directory_digest(current)
+            h.update(f"{os.path.relpath(current, self.base_dir)}\0{digest}\0".encode("utf-8"))
+            pending.extend(sorted(modules, reverse=True))
+        return h.hexdigest()
+
+    def fingerprint(self, directory, serial, lineage):
+        """Fingerprint of the target in directory whose remote state is at serial"""
+        try:
+            with open(os.path.join(directory, LOCK_FILE), "rb") as f:
+                lock = hashlib.sha256(f.read()).hexdigest()
+        except FileNotFoundError:
+            lock = None
+        return {"config": self.config_digest(directory), "lock": lock, "serial": serial, "lineage": lineage}
+
+    def unchanged(self, key, fingerprint):
+        """Whether key was clean when last checked, with the same fingerprint"""
+        if self.full:
+            return False
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and all(entry.get(name) == value for name, value in fingerprint.items())
+
+    def record(self, key, fingerprint):
+        """Remember fingerprint as the last clean check of key"""
+        with self._lock:
+            self._entries[key] = {**fingerprint, "checked": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+            self._dirty = True
+
+    def forget(self, key):
+        """Drop key's fingerprint: it drifted or failed"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump({"version": VERSION, "targets": self._entries}, f, indent=1, sort_keys=True)
+                f.write("\n")
+            os.replace(f"{self.path}.tmp", self.path)
+            self._dirty = False
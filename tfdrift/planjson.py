@@ -0,0 +1,138 @@
+"""
+Resource-level changes from terraform show -json, read as a stream
+
+A plan's JSON document is one (often very large) object. Only two of its
+top-level arrays matter for drift:
+
+    resource_drift      objects changed outside Terraform since the last
+                        apply, found while refreshing
+    resource_changes    the actions the plan would take
+
+iter_elements() scans the document as it arrives and decodes the elements
+of those arrays one at a time; every other value (planned_values,
+prior_state, configuration, ...) is skipped by a bracket-counting scan
+without being decoded or held in memory. records() turns the elements
+into flat change records:
+
+    {"kind": "drift" | "change", "address": ..., "type": ...,
+     "action": "create" | "update" | "delete" | "replace" | "read",
+     "attributes": [names of the top-level attributes that change]}
+
+Only attribute names are kept, never values, so records carry no secrets.
+"""
+
+import json
+import re
+
+CHUNK = 64 * 1024
+KEYS = {"resource_drift": "drift", "resource_changes": "change"}
+
+# A string (possibly cut off at the end of the buffer) or a bracket
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*("|\\?\Z)|[\[\]{}]', re.DOTALL)
+_ARRAY_START = re.compile(r"\s*:\s*(\S)")
+_SEPARATOR = re.compile(r"[\s,]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_elements(read, keys=KEYS):
+    """Yield (key, element) for every element of the top-level arrays named in keys
+
+    read(n) returns the next chunk of the document ("" at the end), like
+    the read method of a text file.
+    """
+    buf = ""
+    pos = 0
+    depth = 0
+    array = None
+    eof = False
+    while True:
+        if array is not None:
+            m = _SEPARATOR.match(buf, pos)
+            pos = m.end()
+            if pos < len(buf) and buf[pos] == "]":
+                array = None
+                pos += 1
+                continue
+            if pos < len(buf):
+                try:
+                    element, end = _decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    yield array, element
+                    pos = end
+                    continue
+        else:
+            for m in _TOKEN.finditer(buf, pos):
+                token = m.group()
+                if token[0] == '"':
+                    if m.group(1) != '"':
+                        break  # string cut off: wait for the rest
+                    if depth == 1 and token[1:-1] in keys:
+                        after = _ARRAY_START.match(buf, m.end())
+                        if after is None:
+                            break  # the value has not arrived yet
+                        if after.group(1) == "[":
+                            array = token[1:-1]
+                            pos = after.end()
+                            break
+                    pos = m.end()
+                elif token in "[{":
+                    depth += 1
+                    pos = m.end()
+                else:
+                    depth -= 1
+                    pos = m.end()
+            else:
+                pos = len(buf)
+            if array is not None:
+                continue
+        if eof:
+            if array is not None or depth:
+                raise ValueError("plan JSON ended early")
+            return
+        buf = buf[pos:]
+        pos = 0
+        chunk = read(CHUNK)
+        if chunk:
+            buf += chunk
+        else:
+            eof = True
+
+
+def action(actions):
+    """One word for a Terraform actions list, e.g. ["delete", "create"] -> replace"""
+    if len(actions) == 2:
+        return "replace"
+    return actions[0] if actions else "no-op"
+
+
+def changed_attributes(change):
+    """Sorted names of the top-level attributes a change modifies"""
+    before = change.get("before")
+    after = change.get("after")
+    if not isinstance(before, dict) or not isinstance(after, dict):
+        return []
+    names = {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+    unknown = change.get("after_unknown")
+    if isinstance(unknown, dict):
+        # Attributes only known after apply differ from their current value
+        names.update(name for name, value in unknown.items() if value and name in before)
+    return sorted(names)
+
+
+def records(read):
+    """Yield a change record for every drifted or changing resource of a plan"""
+    for key, element in iter_elements(read):
+        change = element.get("change", {})
+        verb = action(change.get("actions", []))
+        if verb == "no-op":
+            continue
+        yield {
+            "kind": KEYS[key],
+            "address": element.get("address"),
+            "type": element.get("type"),
+            "action": verb,
+            "attributes": changed_attributes(change),
+        }
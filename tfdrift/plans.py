@@ -0,0 +1,77 @@
+"""
+Saved drift plans, reused by tfdrift fix (make drift-fix)
+
+A drifted target keeps the plan its check saved (tfplan) next to
+tfplan.meta.json, which records what the plan was computed against: the
+target's fingerprint (config and lock file digests, remote state serial
+and lineage, see tfdrift.fingerprint) and when it was planned.
+
+Fixing the drift applies that exact plan, skipping the second refresh
+and plan a plain terraform apply would do, as long as nothing moved
+since: same state serial and lineage, same config and lock file, and a
+plan younger than MAX_AGE. Otherwise the saved plan is dropped and the
+target is planned and applied afresh. terraform itself refuses a saved
+plan whose state has moved on; checking first turns that error into the
+fallback instead.
+
+Plans can hold sensitive values, so a kept plan is readable by its owner
+only.
+"""
+
+import contextlib
+import json
+import os
+import time
+
+from tfdrift.store import timestamp
+
+PLAN_FILE = "tfplan"
+META_FILE = "tfplan.meta.json"
+# Seconds a saved plan stays eligible for reuse: infrastructure drifting
+# further after the check would not be in it
+MAX_AGE = 24 * 3600
+
+
+def keep(directory, fingerprint):
+    """Keep the plan just saved in directory, recording the fingerprint it was planned against"""
+    os.chmod(os.path.join(directory, PLAN_FILE), 0o600)
+    path = os.path.join(directory, META_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({**fingerprint, "planned": time.time(), "planned_at": timestamp()}, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(f"{path}.tmp", path)
+
+
+def discard(directory):
+    """Remove a saved plan and its metadata from directory"""
+    for name in (PLAN_FILE, META_FILE):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(directory, name))
+
+
+def load(directory):
+    """Metadata of the plan saved in directory, or None if there is no usable one"""
+    if not os.path.exists(os.path.join(directory, PLAN_FILE)):
+        return None
+    try:
+        with open(os.path.join(directory, META_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def stale(meta, fingerprint, max_age=MAX_AGE):
+    """Why the saved plan of meta cannot be applied over fingerprint, or None if it can"""
+    if meta is None:
+        return "no saved plan"
+    if fingerprint is None:
+        return "remote state could not be read"
+    if (meta.get("lineage"), meta.get("serial")) != (fingerprint["lineage"], fingerprint["serial"]):
+        return f"state serial moved from {meta.get('serial')} to {fingerprint['serial']}"
+    if meta.get("config") != fingerprint["config"]:
+        return "configuration changed"
+    if meta.get("lock") != fingerprint["lock"]:
+        return "provider lock file changed"
+    if time.time() - meta.get("planned", 0) > max_age:
+        return f"planned at {meta.get('planned_at')}, more than {max_age // 3600}h ago"
+    return None
@@ -0,0 +1,130 @@
+"""
+Content-addressed drift reports (drift-reports/objects/)
+
+A drifted target's plan text is stored once per distinct content, gzipped,
+under the SHA-256 of the text:
+
+    drift-reports/objects/3f/3fa9...c2.txt.gz
+
+A target that keeps drifting the same way every night adds a row to the
+drift history (tfdrift.store) pointing at the same object instead of
+another copy. The gzip header carries no name or timestamp, so equal
+reports are byte-identical files as well.
+
+The history in drift.db is the index of reports. compact() drops history
+older than the retention period and then every object no row refers to
+any more, so disk use is bounded by the retention period and by how many
+distinct reports it holds, however many runs there were. It also brings
+in reports written by earlier versions as drift-reports/<layer>-<env>-
+<timestamp>.txt.
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+
+from tfdrift.store import timestamp
+
+OBJECTS_DIR = "objects"
+SUFFIX = ".txt.gz"
+# Days of drift history (and the reports it refers to) kept by compact()
+DEFAULT_RETENTION_DAYS = 365
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+# Plain-text reports of earlier versions: <layer>-<env>-YYYYmmdd-HHMMSS.txt
+_LEGACY = re.compile(r"^(?P<layer>[a-z0-9_]+)-(?P<env>[A-Za-z0-9_-]+)-(?P<ts>\d{8}-\d{6})\.txt$")
+
+
+def is_digest(value):
+    """Whether value names a stored report (rather than a legacy path)"""
+    return bool(value) and _DIGEST.match(value) is not None
+
+
+class ReportStore:
+    """Gzipped plan texts under reports_dir/objects/, by content digest"""
+
+    def __init__(self, reports_dir):
+        self.reports_dir = reports_dir
+        self.objects_dir = os.path.join(reports_dir, OBJECTS_DIR)
+
+    def path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + SUFFIX)
+
+    def put(self, text):
+        """Store text; return (digest, whether it was already stored)"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            return digest, True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=f, mtime=0) as gz:
+                gz.write(data)
+        os.replace(tmp, path)
+        return digest, False
+
+    def read(self, digest):
+        with gzip.open(self.path(digest), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def digests(self):
+        """Digests of every stored report"""
+        try:
+            shards = os.listdir(self.objects_dir)
+        except FileNotFoundError:
+            return
+        for shard in shards:
+            for name in os.listdir(os.path.join(self.objects_dir, shard)):
+                if name.endswith(SUFFIX):
+                    yield name[:-len(SUFFIX)]
+
+    def size(self):
+        """Bytes used by stored reports"""
+        return sum(os.path.getsize(self.path(digest)) for digest in self.digests())
+
+    def remove(self, digest):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def legacy(self):
+        """(path, layer, env, checked_at) of every plain-text report of earlier versions"""
+        try:
+            names = sorted(os.listdir(self.reports_dir))
+        except FileNotFoundError:
+            return
+        for name in names:
+            m = _LEGACY.match(name)
+            if m is not None:
+                # Their timestamps are local time
+                checked_at = timestamp(time.mktime(time.strptime(m.group("ts"), "%Y%m%d-%H%M%S")))
+                yield os.path.join(self.reports_dir, name), m.group("layer"), m.group("env"), checked_at
+
+
+def compact(history, reports, retention_days=DEFAULT_RETENTION_DAYS):
+    """Apply the retention policy; return (history rows dropped, reports removed)
+
+    Plain-text reports of earlier versions are moved into the store first.
+    history is the DriftStore indexing the ReportStore reports; with
+    retention_days 0 (or None) history is kept forever.
+    """
+    for path, layer, env, checked_at in list(reports.legacy()):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            digest, _ = reports.put(f.read())
+        history.add_report(layer, env, checked_at, digest, path)
+        os.remove(path)
+    dropped = history.prune(timestamp(time.time() - retention_days * 86400)) if retention_days else 0
+    removed = 0
+    if dropped:
+        referenced = history.referenced()
+        for digest in list(reports.digests()):
+            if digest not in referenced:
+                reports.remove(digest)
+                removed += 1
+    return dropped, removed
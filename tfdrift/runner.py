@@ -0,0 +1,317 @@
+"""
+Parallel drift checks
+
+Every Target (one layers/<layer>/environments/<env> directory) is checked
+by running terraform plan -detailed-exitcode in it, initializing the
+directory first if needed. Targets are checked on a pool of worker
+threads, each waiting on its own terraform process, so a sweep takes
+about as long as its slowest plans instead of the sum of all of them.
+
+Every check has a deadline: a terraform process still running when it
+passes, or when the run is cancelled (Ctrl-C), gets SIGINT so it can
+release its state lock, and SIGKILL if it has not exited KILL_GRACE
+seconds later. terraform runs in its own session, so a Ctrl-C in the
+terminal reaches the runner only and never kills a plan half-way.
+
+With a tfdrift.fingerprint.Fingerprints store, a target whose config,
+provider lock file and remote state serial are unchanged since its last
+clean check only gets a refresh-only plan (a full plan follows if that
+finds drift), or is skipped altogether with skip_unchanged.
+
+A drifted target's saved plan is read back through terraform show -json
+(see tfdrift.planjson) into one change record per drifted or changing
+resource, and the plan is kept for tfdrift fix along with the state
+serial it was computed against (see tfdrift.plans).
+
+A check's output is captured and returned in its Result instead of being
+printed, so callers can print each result as one block and results of
+concurrent checks never interleave.
+"""
+
+import contextlib
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from tfdrift import planjson, plans
+from tfdrift.reports import ReportStore
+
+NO_DRIFT = "no-drift"
+DRIFT = "drift"
+ERROR = "error"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"
+UNCHANGED = "unchanged"
+CANCELLED = "cancelled"
+
+# Statuses of targets that were actually checked, and of failed checks
+CHECKED = (NO_DRIFT, DRIFT, ERROR, TIMEOUT)
+FAILED = (ERROR, TIMEOUT)
+
+DEFAULT_JOBS = 4
+# Seconds a single target may take, init and plan together
+DEFAULT_TIMEOUT = 30 * 60
+# Seconds terraform gets to exit after SIGINT before it is killed
+KILL_GRACE = 15
+# Seconds between checks of a running terraform for its deadline
+POLL = 0.2
+
+# terraform's provider plugin cache is not safe for concurrent inits
+_init_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Target:
+    """One layer/environment directory to check for drift"""
+
+    layer: str
+    env: str
+
+    @property
+    def path(self):
+        return f"layers/{self.layer}/environments/{self.env}"
+
+    def __str__(self):
+        return f"{self.layer}/{self.env}"
+
+
+@dataclass
+class Result:
+    """Outcome of checking one target
+
+    output is what terraform printed (the plan, or the failing command's
+    output); report is the digest of a drifted target's plan text in the
+    report store (see tfdrift.reports) and changes its change records
+    (see tfdrift.planjson).
+    """
+
+    target: Target
+    status: str
+    message: str = ""
+    output: str = ""
+    seconds: float = 0.0
+    report: str = None
+    changes: list = field(default_factory=list)
+
+
+def _stop(proc):
+    """Interrupt proc's process group, kill it after KILL_GRACE; return its output"""
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGINT)
+    try:
+        out, _ = proc.communicate(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        out, _ = proc.communicate()
+    return out
+
+
+def terraform(args, cwd, deadline=None, cancel=None):
+    """Run terraform with args in cwd; return its exit status and output
+
+    The status is None if the process was stopped because deadline (a
+    time.monotonic() value) passed or cancel was set.
+    """
+    env = {**os.environ, "TF_IN_AUTOMATION": "1", "TF_INPUT": "0"}
+    proc = subprocess.Popen(
+        ["terraform", *args], cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, start_new_session=True,
+    )
+    while True:
+        try:
+            out, _ = proc.communicate(timeout=POLL)
+            return proc.returncode, out
+        except subprocess.TimeoutExpired:
+            if _expired(deadline, cancel):
+                return None, _stop(proc)
+
+
+def _expired(deadline, cancel):
+    """Whether a check must stop: deadline passed or cancel set"""
+    return cancel is not None and cancel.is_set() or deadline is not None and time.monotonic() >= deadline
+
+
+def _watch(proc, deadline, cancel):
+    """Stop proc like terraform() does, from a thread, while its output is read elsewhere"""
+    while proc.poll() is None:
+        if _expired(deadline, cancel):
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(proc.pid, signal.SIGINT)
+            try:
+                proc.wait(timeout=KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(proc.pid, signal.SIGKILL)
+            return
+        time.sleep(POLL)
+
+
+def show_changes(directory, plan=plans.PLAN_FILE, deadline=None, cancel=None):
+    """Change records of the saved plan in directory, or None if terraform show fails
+
+    terraform show is stopped (and None returned) once deadline passes or
+    cancel is set, as terraform() does.
+    """
+    env = {**os.environ, "TF_IN_AUTOMATION": "1"}
+    proc = subprocess.Popen(
+        ["terraform", "show", "-json", "-no-color", plan], cwd=directory, env=env, stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, start_new_session=True,
+    )
+    watcher = threading.Thread(target=_watch, args=(proc, deadline, cancel), daemon=True)
+    watcher.start()
+    try:
+        changes = list(planjson.records(proc.stdout.read))
+    except ValueError:
+        changes = None
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None and changes is None:
+            proc.kill()
+        proc.wait()
+        watcher.join()
+    return changes if proc.returncode == 0 else None
+
+
+def _state_serial(output):
+    """(serial, lineage) of the state printed by terraform state pull, if any"""
+    try:
+        state = json.loads(output)
+    except ValueError:
+        return None
+    if not isinstance(state, dict) or "serial" not in state:
+        return None
+    return state["serial"], state.get("lineage")
+
+
+def state_serial(directory, deadline=None, cancel=None):
+    """terraform state pull's exit status and output, and the (serial, lineage) it showed
+
+    The serial is None without a readable state; the status is None if
+    terraform was stopped (see terraform()).
+    """
+    code, output = terraform(["state", "pull"], directory, deadline, cancel)
+    return code, output, _state_serial(output) if code == 0 else None
+
+
+def check(target, base_dir, reports_dir, timeout=DEFAULT_TIMEOUT, cancel=None, fingerprints=None,
+          skip_unchanged=False):
+    """Check one target for drift and return its Result
+
+    With fingerprints, an unchanged target gets a refresh-only plan (or
+    none with skip_unchanged) and a clean target's fingerprint is stored.
+    """
+    start = time.monotonic()
+    directory = os.path.join(base_dir, target.path)
+    if not os.path.isdir(directory):
+        return Result(target, SKIPPED, "Directory not found")
+    if cancel is not None and cancel.is_set():
+        return Result(target, CANCELLED)
+    deadline = start + timeout if timeout else None
+
+    def stopped(output):
+        status = CANCELLED if cancel is not None and cancel.is_set() else TIMEOUT
+        message = f"Stopped after {timeout:g}s" if status == TIMEOUT else "Cancelled"
+        return Result(target, status, message, output, time.monotonic() - start)
+
+    if not os.path.isdir(os.path.join(directory, ".terraform")):
+        lock = _init_lock if os.environ.get("TF_PLUGIN_CACHE_DIR") else contextlib.nullcontext()
+        with lock:
+            code, output = terraform(
+                ["init", "-backend-config=backend.conf", "-upgrade", "-no-color"], directory, deadline, cancel
+            )
+        if code is None:
+            return stopped(output)
+        if code != 0:
+            return Result(target, ERROR, "Terraform init failed", output, time.monotonic() - start)
+
+    fingerprint = None
+    if fingerprints is not None:
+        code, output, serial = state_serial(directory, deadline, cancel)
+        if code is None:
+            return stopped(output)
+        # Without a readable state there is nothing to compare: plan in full
+        if serial is not None:
+            fingerprint = fingerprints.fingerprint(directory, *serial)
+
+    kept = False
+    try:
+        if fingerprint is not None and fingerprints.unchanged(target.path, fingerprint):
+            if skip_unchanged:
+                return Result(target, UNCHANGED, "Config, lock file and state serial unchanged since last clean check")
+            code, output = terraform(
+                ["plan", "-refresh-only", "-detailed-exitcode", "-no-color"], directory, deadline, cancel
+            )
+            if code is None:
+                return stopped(output)
+            if code == 0:
+                fingerprints.record(target.path, fingerprint)
+                return Result(target, NO_DRIFT, "Infrastructure matches Terraform state (refresh-only)",
+                              output, time.monotonic() - start)
+            # Drifted or failed: a full plan reports what changed
+
+        code, output = terraform(
+            ["plan", "-detailed-exitcode", "-no-color", f"-out={plans.PLAN_FILE}"], directory, deadline, cancel
+        )
+        if code is None:
+            return stopped(output)
+        seconds = time.monotonic() - start
+        if fingerprints is not None:
+            if code == 0 and fingerprint is not None:
+                fingerprints.record(target.path, fingerprint)
+            else:
+                fingerprints.forget(target.path)
+        if code == 0:
+            return Result(target, NO_DRIFT, "Infrastructure matches Terraform state", output, seconds)
+        if code == 2:
+            changes = show_changes(directory, deadline=deadline, cancel=cancel)
+            if _expired(deadline, cancel):
+                return stopped(output)
+            report, _ = ReportStore(reports_dir).put(output)
+            if fingerprint is not None:
+                plans.keep(directory, fingerprint)
+                kept = True
+            message = "Changes found!" if changes is not None else "Changes found! (terraform show -json failed)"
+            return Result(target, DRIFT, message, output, seconds, report, changes or [])
+        return Result(target, ERROR, "Terraform plan failed", output, seconds)
+    finally:
+        if not kept:
+            plans.discard(directory)
+
+
+def run(targets, base_dir, reports_dir, jobs=DEFAULT_JOBS, timeout=DEFAULT_TIMEOUT, cancel=None,
+        fingerprints=None, skip_unchanged=False):
+    """Check targets on jobs workers, yielding each Result as it completes
+
+    A KeyboardInterrupt while waiting sets cancel: running checks stop
+    their terraform, targets not started yet come back CANCELLED, and
+    every target still yields its Result. A caller that stops iterating
+    early sets cancel as well: queued checks are dropped and running ones
+    stopped.
+    """
+    if cancel is None:
+        cancel = threading.Event()
+    os.makedirs(reports_dir, exist_ok=True)
+    pool = ThreadPoolExecutor(max_workers=max(1, jobs))
+    finished = False
+    try:
+        pending = {pool.submit(check, target, base_dir, reports_dir, timeout, cancel, fingerprints, skip_unchanged)
+                   for target in targets}
+        while pending:
+            try:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            except KeyboardInterrupt:
+                cancel.set()
+                continue
+            for future in done:
+                yield future.result()
+        finished = True
+    finally:
+        if not finished:
+            cancel.set()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,164 @@
+"""
+Drift history in SQLite (drift-reports/drift.db)
+
+Every check of a run is appended to the checks table and every drifted
+or changing resource it found to the changes table, with the layer,
+environment and time copied onto each change so the common questions are
+answered from one index:
+
+    which resources drifted most in prod this month
+    (env, checked_at) -> GROUP BY address
+
+checks.report is the digest of the check's plan text in the report store
+(see tfdrift.reports), which makes this table the index of reports.
+
+The database is written from one thread only (the one printing results);
+workers hand their change records over in each Result.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+DB_FILE = "drift.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    checked_at TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    env TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds REAL,
+    report TEXT
+);
+CREATE INDEX IF NOT EXISTS checks_target ON checks (layer, env, checked_at);
+
+CREATE TABLE IF NOT EXISTS changes (
+    check_id INTEGER NOT NULL REFERENCES checks (id),
+    checked_at TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    env TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    address TEXT NOT NULL,
+    type TEXT,
+    action TEXT NOT NULL,
+    attributes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_env ON changes (env, checked_at);
+CREATE INDEX IF NOT EXISTS changes_address ON changes (address, checked_at);
+"""
+
+# Columns query() can group by
+GROUPS = ("address", "type", "layer", "env", "action")
+
+
+def timestamp(seconds=None):
+    """UTC ISO 8601 time, as stored in checked_at"""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+class DriftStore:
+    """Append-only history of drift checks and the resources they found"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        # Must be set before the first table is created to take effect
+        self.db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def add(self, result, checked_at=None):
+        """Append a Result and its change records"""
+        checked_at = checked_at or timestamp()
+        target = result.target
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO checks (checked_at, layer, env, status, seconds, report) VALUES (?, ?, ?, ?, ?, ?)",
+                (checked_at, target.layer, target.env, result.status, result.seconds, result.report),
+            )
+            self.db.executemany(
+                "INSERT INTO changes (check_id, checked_at, layer, env, kind, address, type, action, attributes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, checked_at, target.layer, target.env, record["kind"], record["address"],
+                  record["type"], record["action"], json.dumps(record["attributes"]))
+                 for record in result.changes],
+            )
+
+    def add_report(self, layer, env, checked_at, digest, path=None):
+        """Point the checks that saved their report at path to digest instead
+
+        A report of an earlier version no check refers to is appended as
+        a drifted check of its own.
+        """
+        with self.db:
+            if path is not None:
+                cursor = self.db.execute("UPDATE checks SET report = ? WHERE report = ?", (digest, path))
+                if cursor.rowcount:
+                    return
+            self.db.execute(
+                "INSERT INTO checks (checked_at, layer, env, status, report) VALUES (?, ?, ?, 'drift', ?)",
+                (checked_at, layer, env, digest),
+            )
+
+    def reports(self, limit=10, env=None, layer=None):
+        """(checked_at, layer, env, report) of the latest checks with a report, newest first"""
+        where, params = self._where(env=env, layer=layer)
+        where = f"{where} AND report IS NOT NULL" if where else " WHERE report IS NOT NULL"
+        return self.db.execute(
+            f"SELECT checked_at, layer, env, report FROM checks{where} ORDER BY checked_at DESC, id DESC LIMIT ?",
+            [*params, limit],
+        ).fetchall()
+
+    def referenced(self):
+        """Digests of every report the history still refers to"""
+        return {row[0] for row in self.db.execute("SELECT DISTINCT report FROM checks WHERE report IS NOT NULL")}
+
+    def prune(self, before):
+        """Drop checks and changes older than the checked_at before; return the checks dropped"""
+        with self.db:
+            self.db.execute("DELETE FROM changes WHERE checked_at < ?", (before,))
+            dropped = self.db.execute("DELETE FROM checks WHERE checked_at < ?", (before,)).rowcount
+        if dropped:
+            self.db.execute("PRAGMA incremental_vacuum")
+        return dropped
+
+    def _where(self, env=None, layer=None, since=None, kind=None):
+        clauses, params = [], []
+        for column, value in (("env", env), ("layer", layer), ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("checked_at >= ?")
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def top(self, by="address", limit=20, **filters):
+        """(value, checks, last seen) of the values of column by found changed in the most checks"""
+        if by not in GROUPS:
+            raise ValueError(f"cannot group by {by!r} (use one of {', '.join(GROUPS)})")
+        where, params = self._where(**filters)
+        return self.db.execute(
+            f"SELECT {by}, COUNT(DISTINCT check_id) AS checks, MAX(checked_at) FROM changes{where} "
+            f"GROUP BY {by} ORDER BY checks DESC, {by} LIMIT ?",
+            [*params, limit],
+        ).fetchall()
+
+    def changes(self, **filters):
+        """Yield every matching change as a record dict, oldest first"""
+        where, params = self._where(**filters)
+        cursor = self.db.execute(
+            f"SELECT checked_at, layer, env, kind, address, type, action, attributes FROM changes{where} "
+            "ORDER BY checked_at, rowid",
+            params,
+        )
+        for checked_at, layer, env, kind, address, type, action, attributes in cursor:
+            yield {"checked_at": checked_at, "layer": layer, "env": env, "kind": kind, "address": address,
+                   "type": type, "action": action, "attributes": json.loads(attributes)}
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,9 @@
+"""
+Shared rendering pipeline for the Terraform generator scripts
+"""
+
+from tfgen import cli
+from tfgen.engine import Target, run
+from tfgen.writer import WriteStats, write_if_changed
+
+__all__ = ["Target", "WriteStats", "cli", "run", "write_if_changed"]
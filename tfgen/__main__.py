@@ -0,0 +1,7 @@
+"""python3 -m tfgen: run the Terraform code generators"""
+
+import sys
+
+from tfgen.cli import main
+
+sys.exit(main())
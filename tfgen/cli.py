@@ -0,0 +1,311 @@
+"""
+Command line of the Terraform code generators
+
+    python3 -m tfgen [GENERATOR ...] [options]
+
+runs the named generators (all of them by default) as one pipeline; the
+generate-*.py scripts are shortcuts for a single generator.
+"""
+
+import argparse
+import importlib
+import os
+import time
+
+from tfgen import generators, merkle, profile, templates
+from tfgen.diff import dry_run, unified_diff
+from tfgen.engine import default_jobs, run
+from tfgen.environments import ENVIRONMENTS_FILE
+from tfgen.inventory import InventoryError
+from tfgen.manifest import Manifest
+from tfgen.sinks import BUNDLE_FORMATS, BundleSink, TarSink
+from tfgen.validate import ValidationError
+from tfgen.watch import watcher
+from tfgen.writer import CREATED
+
+# Generate into the repository holding the templates by default
+BASE_DIR = os.path.dirname(templates.TEMPLATES_DIR)
+
+
+# Selection flags a generator can offer, by the dimension they filter
+FILTERS = {
+    "layer": "only generate layers matching PATTERN (glob, repeatable)",
+    "env": "only generate environments matching PATTERN (glob, repeatable)",
+    "module": "only generate modules matching PATTERN (glob, repeatable)",
+}
+
+
+def parser(description, base_dir, inventory=False, filters=(), prog=None):
+    """Build the argument parser every generator starts from
+
+    Generators driven by the environment list also accept --inventory;
+    filters names the FILTERS selection flags the generator supports.
+    """
+    p = argparse.ArgumentParser(
+        prog=prog, description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=default_jobs(),
+        help="number of files rendered and written in parallel (default: CPU count)",
+    )
+    p.add_argument(
+        "--base-dir",
+        default=base_dir,
+        help=f"repository root to generate into (default: {base_dir})",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render every file, ignoring the generation manifest",
+    )
+    p.add_argument(
+        "--in-place",
+        action="store_true",
+        help="write files as they are rendered instead of staging and committing them atomically",
+    )
+    p.add_argument(
+        "--no-validate",
+        dest="validate",
+        action="store_false",
+        help="skip the in-process HCL syntax check of rendered files",
+    )
+    p.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="render in memory and list files that would change, without writing",
+    )
+    p.add_argument(
+        "--diff",
+        action="store_true",
+        help="print a unified diff of every file that would change (implies --dry-run)",
+    )
+    p.add_argument(
+        "--check",
+        action="store_true",
+        help="report stale subtrees via Merkle hashes and exit 1 if any; writes nothing",
+    )
+    p.add_argument(
+        "--tar",
+        metavar="FILE",
+        help="write every generated file into a tar archive (.tar, .tar.gz) instead of the base dir",
+    )
+    p.add_argument(
+        "--bundle",
+        metavar="DIR",
+        help="write every environment directory as a reproducible archive named by content hash into DIR",
+    )
+    p.add_argument(
+        "--bundle-format",
+        choices=BUNDLE_FORMATS,
+        default=BUNDLE_FORMATS[0],
+        help=f"archive format of --bundle (default: {BUNDLE_FORMATS[0]})",
+    )
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const=profile.DEFAULT_TRACE,
+        metavar="TRACE",
+        help=f"record per-phase timings into a Chrome trace (default: {profile.DEFAULT_TRACE}) "
+             "and print the slowest templates and directories",
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and regenerate the files affected by every template or environment edit",
+    )
+    for name in filters:
+        p.add_argument(f"--{name}", action="append", default=[], metavar="PATTERN", help=FILTERS[name])
+    if inventory:
+        p.add_argument(
+            "--inventory",
+            metavar="FILE",
+            help="stream environments from an NDJSON or CSV inventory instead of environments.toml",
+        )
+    return p
+
+
+def show_changes(targets, args):
+    """Run a dry run for the parsed args; return 1 if anything would change"""
+    changes, sink = dry_run(targets, args.base_dir, jobs=args.jobs, force=args.force)
+    for status, path in changes:
+        if args.diff:
+            print(unified_diff(args.base_dir, path, sink.files[path]), end="")
+        else:
+            print(f"  {'+' if status == CREATED else '~'} {path}")
+    if changes:
+        print(f"⚠ {len(changes)} generated file(s) out of sync with the templates")
+        return 1
+    print("✅ Generated files are in sync")
+    return 0
+
+
+def check_sync(targets, args):
+    """Compare Merkle trees of the inputs and the disk; return 1 if stale"""
+    expected, actual = merkle.build(targets, args.base_dir, jobs=args.jobs)
+    stale = list(merkle.stale_subtrees(expected, actual))
+    for directory, names in stale:
+        print(f"  ⚠ {directory}/: {', '.join(names)}")
+    if stale:
+        files = sum(len(names) for _, names in stale)
+        print(f"⚠ {files} stale file(s) in {len(stale)} director{'y' if len(stale) == 1 else 'ies'}")
+        return 1
+    print(f"✅ Generated tree in sync ({expected.hash()[:16]})")
+    return 0
+
+
+def report_invalid(error, args):
+    """Print the errors of a ValidationError raised by run()"""
+    for message in error.errors:
+        print(f"  ❌ {message}")
+    print(f"❌ {len(error.errors)} error(s) in generated files; "
+          f"{'invalid files were skipped' if args.in_place else 'nothing was written'}")
+
+
+def _affected(target, paths):
+    """True if target may render differently after paths changed"""
+    if target.render is not templates.render:
+        return True
+    return any(source == path or source.startswith(path + os.sep)
+               for source in target.args[0].sources for path in paths)
+
+
+def watch(names, args):
+    """Generate once, then regenerate whatever each edit affects until Ctrl-C
+
+    Compiled templates, the manifest and the imported generator modules
+    stay in memory between runs. An edited template (or fragment) only
+    re-renders the targets built from it; an edited environments.toml,
+    generator module or inventory re-plans every target and lets the
+    manifest skip the unchanged ones.
+    """
+    manifest = Manifest.load(args.base_dir)
+    modules = {os.path.abspath(module.__file__): module
+               for module in generators.Pipeline(names, args).generators.values()}
+    inventory = os.path.abspath(args.inventory) if getattr(args, "inventory", None) else None
+
+    def regenerate(select=None):
+        targets = generators.Pipeline(names, args)
+        if select is not None:
+            targets = (target for target in targets if select(target))
+        return run(targets, args.base_dir, jobs=args.jobs, force=args.force, atomic=not args.in_place,
+                   validate=args.validate, manifest=manifest)
+
+    try:
+        print(f"   {regenerate()}")
+    except ValidationError as e:
+        report_invalid(e, args)
+    except (InventoryError, templates.TemplateError) as e:
+        print(f"❌ {e}")
+    files = watcher([templates.TEMPLATES_DIR], [*modules, ENVIRONMENTS_FILE, inventory])
+    print(f"👀 Watching {os.path.relpath(templates.TEMPLATES_DIR)} for changes (Ctrl-C to stop)")
+    try:
+        for paths in files.changes():
+            start = time.perf_counter()
+            edited = sorted(path for path in paths if path.startswith(templates.TEMPLATES_DIR + os.sep))
+            reloaded = [modules[path] for path in paths if path in modules]
+            templates.forget(edited)
+            try:
+                for module in reloaded:
+                    importlib.reload(module)
+                if reloaded or ENVIRONMENTS_FILE in paths or inventory in paths:
+                    stats = regenerate()
+                else:
+                    stats = regenerate(lambda target: _affected(target, edited))
+            except ValidationError as e:
+                report_invalid(e, args)
+                continue
+            except Exception as e:
+                # Keep watching through a broken edit, e.g. a typo in a generator module
+                print(f"❌ {type(e).__name__}: {e}")
+                continue
+            if stats.total:
+                changed = ", ".join(os.path.relpath(path) for path in sorted(paths))
+                print(f"♻  {changed}: {stats} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        files.close()
+    return 0
+
+
+def main(argv=None, generator=None):
+    """Run generators from the command line and return the exit status
+
+    With generator set only that generator runs, and only its options are
+    offered; otherwise generators are picked by positional arguments.
+    """
+    if generator:
+        module = generators.load(generator)
+        p = parser(module.__doc__, BASE_DIR, inventory=module.INVENTORY, filters=module.FILTERS)
+    else:
+        p = parser(__doc__, BASE_DIR, inventory=True, filters=FILTERS, prog="python3 -m tfgen")
+        p.add_argument(
+            "generators",
+            nargs="*",
+            metavar="GENERATOR",
+            help=f"generators to run (default: all of {', '.join(generators.GENERATORS)})",
+        )
+    args = p.parse_args(argv)
+    names = [generator] if generator else args.generators or list(generators.GENERATORS)
+    unknown = sorted(set(names) - set(generators.GENERATORS))
+    if unknown:
+        p.error(f"unknown generator(s): {', '.join(unknown)}")
+
+    # A diff is only ever of a dry run: never write while showing what would change
+    args.dry_run |= args.diff
+    modes = [flag for flag in ("dry_run", "check", "watch", "tar", "bundle") if getattr(args, flag)]
+    if len(modes) > 1:
+        p.error(f"--{modes[0].replace('_', '-')} cannot be combined with --{modes[1].replace('_', '-')}")
+    if args.watch:
+        return watch(names, args)
+    if not args.profile:
+        return generate(names, args)
+
+    profile.start(args.profile)
+    try:
+        return generate(names, args)
+    finally:
+        profiler = profile.stop()
+        print(f"\n⏱  Profile written to {profiler.path}")
+        for line in profiler.summary():
+            print(line)
+
+
+def generate(names, args):
+    """Run the generators for the parsed args and return the exit status"""
+    pipeline = generators.Pipeline(names, args)
+    try:
+        if args.dry_run:
+            return show_changes(pipeline, args)
+        if args.check:
+            return check_sync(pipeline, args)
+        for module in pipeline.generators.values():
+            if module.BANNER:
+                print(module.BANNER)
+        sink = None
+        if args.tar:
+            sink = TarSink(args.tar)
+        elif args.bundle:
+            sink = BundleSink(args.bundle, args.bundle_format)
+        if sink is not None:
+            # Archives hold every file: an empty in-memory manifest renders them all
+            stats = run(pipeline, args.base_dir, jobs=args.jobs, validate=args.validate,
+                        manifest=Manifest(None), sink=sink)
+        else:
+            stats = run(
+                pipeline, args.base_dir, jobs=args.jobs, force=args.force, atomic=not args.in_place,
+                validate=args.validate
+            )
+    except ValidationError as e:
+        report_invalid(e, args)
+        return 1
+    except (InventoryError, templates.TemplateError) as e:
+        print(f"❌ {e}")
+        return 2
+    for name, module in pipeline.generators.items():
+        module.report(args, pipeline.counts[name])
+    print(f"   {stats}")
+    if args.bundle:
+        print(f"📦 {len(sink.bundles)} bundle(s) in {args.bundle} ({sink.reused} unchanged)")
+    return 0
@@ -0,0 +1,47 @@
+"""
+Dry-run mode: compare what the generators would write with the disk
+
+Targets are rendered through the engine into a DiffSink instead of the
+base dir. Each rendered file is hash-compared with the file on disk (after
+a size check) and only files whose content differs are kept in memory;
+unified diffs are computed for those files alone. Targets the generation
+manifest shows as fresh are not rendered at all.
+
+Nothing on disk is modified, including the manifest, so the dry run can
+serve as a pre-commit check that generated files are in sync.
+"""
+
+import difflib
+import os
+
+from tfgen.engine import run
+from tfgen.sinks import DiffSink
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def unified_diff(base_dir, rel_path, data):
+    """Unified diff between the file on disk and its rendered content"""
+    before = _read(os.path.join(base_dir, rel_path))
+    old = before.decode("utf-8", errors="replace").splitlines(keepends=True) if before is not None else []
+    new = data.decode("utf-8").splitlines(keepends=True)
+    source = f"a/{rel_path}" if before is not None else "/dev/null"
+    lines = difflib.unified_diff(old, new, source, f"b/{rel_path}")
+    return "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in lines)
+
+
+def dry_run(targets, base_dir, jobs=1, force=False):
+    """Render every target in memory and return (changes, sink)
+
+    changes is a list of (status, path) for files that would be created
+    or rewritten, sorted by path; sink.files holds their rendered content.
+    """
+    sink = DiffSink(base_dir)
+    run(targets, base_dir, jobs=jobs, force=force, validate=False, sink=sink)
+    return sink.changes, sink
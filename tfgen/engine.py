@@ -0,0 +1,157 @@
+"""
+Render engine for the generator scripts
+
+A generator describes its output as a sequence of Targets (a relative path
+plus the function that renders it). The engine renders the whole matrix on
+a thread pool; each worker renders one file and writes it, so rendering of
+one target overlaps with the file I/O of another. Every target is rendered
+independently, so the output is byte-identical to a serial run.
+
+Targets are consumed lazily with a bounded number in flight, so a
+generator can stream an arbitrarily large fleet through the engine
+without memory growing with it.
+
+Rendered Terraform files are syntax-checked in process before they are
+written, including their module calls against the module interface index
+(see tfgen.validate); an invalid file aborts the whole run.
+
+Renderers must be pure functions of their arguments: the generation
+manifest identifies a target's inputs by the renderer's code and args, and
+skips targets whose inputs have not changed since the last run.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from tfgen.interface import ModuleIndex
+from tfgen.manifest import Manifest, input_key
+from tfgen.profile import span
+from tfgen.transaction import Transaction
+from tfgen.validate import ValidationError, Validator
+from tfgen.writer import CACHED, INVALID, InPlaceWriter, WriteStats, digest
+
+
+@dataclass(frozen=True)
+class Target:
+    """A generated file: its path relative to the base dir and its renderer"""
+
+    path: str
+    render: object
+    args: tuple = ()
+
+    def build(self):
+        """Render the file content"""
+        return self.render(*self.args)
+
+
+# Targets queued per worker before the engine waits for results
+QUEUE_DEPTH = 4
+
+
+def default_jobs():
+    """Number of workers used when --jobs is not given"""
+    return os.cpu_count() or 1
+
+
+def emit(base_dir, target, manifest, writer, force=False, validator=None):
+    """Render a single target and hand it to writer if it changed
+
+    Returns the write status and the seconds spent rendering and writing.
+    A target that fails validator is not written and reports INVALID.
+    """
+    with span("file", path=target.path):
+        start = time.perf_counter()
+        with span("manifest"):
+            key = input_key(target)
+            fresh = (not force and base_dir is not None
+                     and manifest.is_fresh(target.path, key, os.path.join(base_dir, target.path)))
+        if fresh:
+            return CACHED, 0.0, time.perf_counter() - start
+
+        rendered = time.perf_counter()
+        with span("render"):
+            data = target.build().encode("utf-8")
+        with span("hash"):
+            content_digest = digest(data)
+        if validator is not None:
+            with span("validate"):
+                valid = validator.check(target.path, data, content_digest)
+            if not valid:
+                return INVALID, time.perf_counter() - rendered, rendered - start
+        written = time.perf_counter()
+        status, written_path = writer.write(target.path, data, content_digest)
+        if written_path is not None:
+            manifest.record(target.path, key, content_digest, written_path)
+        end = time.perf_counter()
+        return status, written - rendered, (rendered - start) + (end - written)
+
+
+def execute(targets, work, jobs=1):
+    """Yield work(target) for every target, on a pool of `jobs` workers
+
+    Results come back in target order, with at most jobs x QUEUE_DEPTH
+    targets in flight.
+    """
+    if jobs <= 1:
+        for target in targets:
+            yield work(target)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for target in targets:
+            pending.append(pool.submit(work, target))
+            if len(pending) >= jobs * QUEUE_DEPTH:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(targets, base_dir, jobs=1, force=False, atomic=True, validate=True, manifest=None, sink=None):
+    """Render and write every target, returning the WriteStats of the run
+
+    Targets whose inputs are unchanged since the last run are not rendered
+    unless force is set. With atomic (the default) changed files are staged
+    and committed together once every target has rendered; otherwise they
+    are written in place as they are rendered.
+
+    With validate, rendered HCL files and their module calls are checked and ValidationError
+    lists the invalid ones after every target has been rendered; nothing is
+    committed in atomic mode.
+
+    A manifest kept from an earlier run (e.g. by --watch) is reused instead
+    of being loaded again. sink replaces the base dir as the destination
+    of rendered files (see tfgen.sinks); with base_dir None nothing is read
+    from or written to disk.
+    """
+    if manifest is None:
+        manifest = Manifest.load(base_dir)
+    if sink is not None:
+        writer = sink
+    else:
+        writer = Transaction(base_dir) if atomic else InPlaceWriter(base_dir)
+    validator = Validator(base_dir, ModuleIndex(base_dir)) if validate else None
+    stats = WriteStats()
+
+    def work(target):
+        return emit(base_dir, target, manifest, writer, force, validator)
+
+    try:
+        for result in execute(targets, work, jobs):
+            stats.record(*result)
+        if validator is not None:
+            validator.save()
+            if validator.errors:
+                raise ValidationError(sorted(validator.errors))
+    except BaseException:
+        writer.abort()
+        if not atomic and sink is None:
+            manifest.save()
+        raise
+    with span("commit"):
+        writer.commit()
+    manifest.save()
+    return stats
@@ -0,0 +1,167 @@
+"""
+The environment model: environments.toml resolved into environment configs
+
+environments.toml at the repository root is the one definition of the
+environments every generator renders. An environment's config is built
+by layering tables, later ones overriding earlier ones:
+
+    [defaults]              every environment
+    [tiers.<tier>]          environments with tier = "<tier>"
+    [environments.<env>]    the environment itself
+    [regions.<region>]      environments whose aws_region is <region>
+
+Values come out as the templates render them (strings, lowercase
+booleans, HCL lists; see tfgen.inventory.hcl_value). Inventory rows are
+resolved the same way, with the row in place of [environments.<env>].
+
+The model is resolved once per process for a given file content, and the
+resolved configs are saved in .tfgen-cache/environments.json keyed by the
+file's digest, so later runs skip parsing and merging altogether. Tier
+bases (defaults + tier) are merged once and shared, so resolving a
+thousand-row inventory costs one dict merge per row.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import tomllib
+
+from tfgen.inventory import InventoryError, hcl_value
+from tfgen.templates import TEMPLATES_DIR
+from tfgen.validate import CACHE_DIR
+
+REPO_DIR = os.path.dirname(TEMPLATES_DIR)
+ENVIRONMENTS_FILE = os.path.join(REPO_DIR, "environments.toml")
+CACHE_FILE = "environments.json"
+# Bump when resolution changes, so cached models are dropped
+VERSION = 1
+
+_memo = {}
+_lock = threading.Lock()
+
+
+def _values(table):
+    return {key: hcl_value(value) for key, value in table.items()}
+
+
+class EnvironmentModel:
+    """Parsed environments.toml: resolves environments and inventory rows"""
+
+    def __init__(self, data, path=ENVIRONMENTS_FILE, text=""):
+        self.path = path
+        self.text = text
+        self.defaults = _values(data.get("defaults", {}))
+        self.tiers = {name: _values(table) for name, table in data.get("tiers", {}).items()}
+        self.environments = {name: _values(table) for name, table in data.get("environments", {}).items()}
+        self.regions = {name: _values(table) for name, table in data.get("regions", {}).items()}
+        self._bases = {}
+
+    def base(self, tier):
+        """defaults overridden by the tier's table, merged once per tier"""
+        base = self._bases.get(tier)
+        if base is None:
+            base = self._bases[tier] = {**self.defaults, **self.tiers.get(tier, {})}
+        return base
+
+    def resolve(self, name, values):
+        """Config of environment name whose own settings are values"""
+        tier = values.get("tier")
+        if tier is not None and tier not in self.tiers:
+            raise InventoryError(self.path, self.line(name), f"environment {name!r} has unknown tier {tier!r}")
+        config = {**self.base(tier), **values}
+        region = self.regions.get(config.get("aws_region"))
+        return {**config, **region} if region else config
+
+    def line(self, name):
+        """Line of environment name's [environments.<name>] table, if it has one"""
+        m = re.search(rf'^[ \t]*\[[ \t]*environments\.(?:{re.escape(name)}|"{re.escape(name)}")[ \t]*\]',
+                      self.text, re.MULTILINE)
+        return self.text.count("\n", 0, m.start()) + 1 if m else None
+
+    def items(self):
+        """(name, config) of every environment in the file, in file order"""
+        return [(name, self.resolve(name, values)) for name, values in self.environments.items()]
+
+
+def parse_model(text, path=ENVIRONMENTS_FILE):
+    """EnvironmentModel of environments.toml's text; invalid TOML is an InventoryError"""
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError as e:
+        raise InventoryError(path, None, str(e)) from None
+    return EnvironmentModel(data, path, text)
+
+
+def load_model(path=ENVIRONMENTS_FILE):
+    """Parse environments.toml into an EnvironmentModel"""
+    with open(path, encoding="utf-8") as f:
+        return parse_model(f.read(), path)
+
+
+def _cache_path():
+    return os.path.join(REPO_DIR, CACHE_DIR, CACHE_FILE)
+
+
+def load_environments(path=ENVIRONMENTS_FILE):
+    """Resolved (name, config) of every environment in environments.toml
+
+    Memoized per process until the file changes, and cached on disk by the
+    file's digest.
+    """
+    st = os.stat(path)
+    signature = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        environments = _memo.get(signature)
+        if environments is not None:
+            return environments
+
+        with open(path, "rb") as f:
+            data = f.read()
+        key = hashlib.sha256(f"v{VERSION}\0".encode("utf-8") + data).hexdigest()
+        try:
+            with open(_cache_path()) as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cached = {}
+        if cached.get("key") == key:
+            environments = [(name, config) for name, config in cached["environments"]]
+        else:
+            environments = parse_model(data.decode("utf-8"), path).items()
+            _save(key, environments)
+        _memo.clear()
+        _memo[signature] = environments
+        return environments
+
+
+def _save(key, environments):
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({"key": key, "environments": environments}, f, indent=1)
+            f.write("\n")
+        os.replace(f"{path}.tmp", path)
+    except OSError:
+        # A read-only checkout still generates, it just resolves every run
+        pass
+
+
+def resolve_rows(rows, path=ENVIRONMENTS_FILE, required=()):
+    """Resolve the streamed (name, values) rows of an Inventory against the model
+
+    Without environments.toml rows are taken as they are. A row with an
+    unknown tier, or whose resolved config lacks one of the required
+    values, is an InventoryError naming the row.
+    """
+    model = load_model(path) if os.path.exists(path) else EnvironmentModel({}, path)
+    for name, values in rows:
+        tier = values.get("tier")
+        if tier is not None and tier not in model.tiers:
+            raise rows.error(f"environment {name!r} has unknown tier {tier!r} (tiers are defined in {path})")
+        config = model.resolve(name, values)
+        missing = [key for key in required if key not in config]
+        if missing:
+            raise rows.error(f"environment {name!r} has no value for {', '.join(map(repr, missing))}")
+        yield name, config
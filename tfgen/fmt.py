@@ -0,0 +1,205 @@
+"""
+Canonical formatting of generated HCL, following `terraform fmt`
+
+Applies the layout rules of Terraform's formatter (hclwrite) in process,
+so generated files come out fmt-clean without a separate
+`terraform fmt -recursive` pass rewriting them:
+
+  - each line is indented two spaces per level of open brackets, where a
+    line that opens brackets adds one level and a line that closes them
+    drops back to the level it closes
+  - the `=` of consecutive single-line arguments is aligned one space
+    after the longest name; a blank line, a comment line, a block header,
+    a closing bracket or an argument whose value continues on the next
+    line (an open bracket or a heredoc) ends the group
+  - trailing comments on consecutive lines are aligned the same way
+  - trailing whitespace is removed; heredoc bodies are left untouched
+
+Spacing between the tokens inside a line is kept as rendered. Lines are
+split into cells once per distinct line and memoized, since thousands of
+generated files share most of their lines.
+"""
+
+import functools
+
+from tfgen import hcl
+
+BRACKETS = {"{": 1, "[": 1, "(": 1, "}": -1, "]": -1, ")": -1}
+INDENT = "  "
+
+# Bumped whenever the layout changes, so every formatted file is re-rendered
+VERSION = 2
+
+
+class _Line:
+    """One line split into hclwrite's lead, assign and comment cells"""
+
+    __slots__ = ("indent", "lead", "assign", "comment", "tail")
+
+    def __init__(self, lead, assign=None, comment=None, tail=""):
+        self.indent = 0
+        self.lead = lead
+        self.assign = assign
+        self.comment = comment
+        # Verbatim text after the line, e.g. a heredoc body and its marker
+        self.tail = tail
+
+
+def _split(text, tokens, end, assign, net):
+    """The _Line for the tokens of a line ending at text[end]
+
+    assign is the index of the first `=` after the line's first token (or
+    None) and net the bracket change of the tokens before it.
+    """
+    if not tokens:
+        return _Line("")
+
+    comment = None
+    if len(tokens) > 1 and tokens[-1].kind == hcl.COMMENT:
+        comment = tokens[-1].value.rstrip()
+        tokens = tokens[:-1]
+
+    last = tokens[-1]
+    tail = ""
+    lead_end = last.end
+    heredoc = last.kind == hcl.TEMPLATE and text.startswith("<<", last.pos)
+    if heredoc:
+        # Heredoc: format its opening line, keep the body verbatim
+        lead_end = text.index("\n", last.pos)
+        tail = text[lead_end:end]
+
+    # Only a value that closes every bracket it opens gets aligned; a
+    # heredoc continues on the next lines like an open bracket
+    if assign is not None and net == 0 and not heredoc:
+        token = tokens[assign]
+        lead = text[tokens[0].pos:token.pos].rstrip()
+        return _Line(lead, "= " + text[token.end:lead_end].strip(), comment, tail)
+    return _Line(text[tokens[0].pos:lead_end].rstrip(), None, comment, tail)
+
+
+def _lines(text):
+    """Yield (line, bracket change) for every logical line of text"""
+    tokens, _ = hcl.tokenize(hcl.Source(text, None), comments=True)
+    line = []
+    net = after = 0
+    assign = None
+    verbatim = False
+    for token in tokens:
+        kind = token.kind
+        if kind == hcl.NEWLINE or kind == hcl.EOF:
+            if kind == hcl.EOF and not line and token.pos >= len(text):
+                return
+            if verbatim:
+                # A block comment spanning lines: leave the whole line as it is
+                yield _Line(text[line[0].pos:token.pos].rstrip(), tail=None), net
+            else:
+                yield _split(text, line, token.pos, assign, after), net
+            line = []
+            net = after = 0
+            assign = None
+            verbatim = False
+            continue
+        change = BRACKETS.get(kind)
+        if change:
+            net += change
+            after += change
+        elif kind == "=" and assign is None and line:
+            assign = len(line)
+            after = 0
+        elif kind == hcl.COMMENT and "\n" in token.value:
+            verbatim = True
+        line.append(token)
+
+
+@functools.lru_cache(maxsize=8192)
+def _layout(line):
+    """(lead, assign, comment, bracket change) of one line on its own"""
+    for parsed, net in _lines(line):
+        return parsed.lead, parsed.assign, parsed.comment, net
+    return "", None, None, 0
+
+
+def _split_lines(text):
+    """(line, bracket change) for every line of text
+
+    Generated files repeat the same lines over and over, so lines are laid
+    out one at a time and memoized. Heredocs and block comments span lines
+    and need the whole text; so does a line that does not lex on its own,
+    e.g. a template interpolation continued on the next line.
+    """
+    if "<<" not in text and "/*" not in text:
+        if text.endswith("\n"):
+            text = text[:-1]
+        try:
+            pairs = []
+            for line in text.split("\n"):
+                lead, assign, comment, net = _layout(line)
+                pairs.append((_Line(lead, assign, comment), net))
+            return pairs
+        except hcl.HCLError:
+            pass
+    return list(_lines(text))
+
+
+def _indent(lines):
+    """Set the indentation level of every line from its bracket changes"""
+    indents = []
+    for line, net in lines:
+        if net < 0:
+            closed = -net
+            while closed > 0 and indents:
+                if closed >= indents[-1]:
+                    closed -= indents.pop()
+                else:
+                    indents[-1] -= closed
+                    closed = 0
+        line.indent = len(indents)
+        if net > 0:
+            indents.append(net)
+
+
+def _align(lines, cell, width):
+    """Pad `cell` of consecutive lines that have one to a common column"""
+    chain = []
+    for line in lines + [None]:
+        if line is not None and getattr(line, cell) is not None:
+            chain.append(line)
+            continue
+        if chain:
+            column = max(width(line) for line in chain)
+            for member in chain:
+                setattr(member, cell, " " * (column - width(member)) + " " + getattr(member, cell))
+            chain = []
+
+
+def format_hcl(text):
+    """text laid out the way `terraform fmt` would lay it out
+
+    Text that does not tokenize is returned unchanged, for the validator
+    to report.
+    """
+    try:
+        pairs = _split_lines(text)
+    except hcl.HCLError:
+        return text
+    _indent(pairs)
+    lines = [line for line, _ in pairs]
+    _align(lines, "assign", lambda line: 2 * line.indent + len(line.lead))
+    _align(lines, "comment", lambda line: 2 * line.indent + len(line.lead) + len(line.assign or ""))
+
+    out = []
+    for line in lines:
+        if line.tail is None:
+            out.append(INDENT * line.indent + line.lead)
+            continue
+        if not line.lead and line.comment is None:
+            out.append("")
+            continue
+        parts = [INDENT * line.indent, line.lead]
+        if line.assign is not None:
+            parts.append(line.assign if line.lead else line.assign.lstrip())
+        if line.comment is not None:
+            parts.append(line.comment if line.lead or line.assign else line.comment.lstrip())
+        parts.append(line.tail)
+        out.append("".join(parts))
+    return "\n".join(out) + ("\n" if text.endswith("\n") else "")
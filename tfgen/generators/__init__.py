@@ -0,0 +1,136 @@
+"""
+Registry of the Terraform code generators
+
+Each generator is a module exposing:
+
+    FILTERS     selection flags it honours, e.g. ("layer", "env")
+    INVENTORY   whether it accepts --inventory
+    BANNER      line printed before it runs, or None
+    plan(args)  its Targets for the parsed command-line args
+    claims(path, args)
+                whether path is one of the files plan(args) generates
+    report(args, count)
+                prints its summary once `count` of its files were generated
+
+Generators are imported on first use, so running one never loads the
+others. Generators that render one set of templates into every
+layers/<layer>/environments/<env>/ directory get their targets(),
+claims() and plan() from an EnvironmentFiles. A Pipeline chains the targets of several generators into a single
+stream for one engine run: one pool, one manifest, one transaction and one
+pass over the output tree.
+"""
+
+import importlib
+from fnmatch import fnmatchcase
+
+from tfgen.engine import Target
+from tfgen.environments import load_environments, resolve_rows
+from tfgen.inventory import read_environments
+from tfgen.templates import render
+
+# name -> module, in run order; a later generator wins when two emit the same path
+GENERATORS = {
+    "layers": "tfgen.generators.layers",
+    "modules": "tfgen.generators.modules",
+    "additional-modules": "tfgen.generators.additional_modules",
+    "configs": "tfgen.generators.configs",
+    "env-files": "tfgen.generators.env_files",
+    "readmes": "tfgen.generators.readmes",
+}
+
+
+# Layers that get a directory per environment
+ENVIRONMENT_LAYERS = ["compute", "database", "storage", "security", "dns", "monitoring"]
+
+
+def register(name, module):
+    """Add a generator module (by import path) to the registry"""
+    GENERATORS[name] = module
+
+
+def load(name):
+    """Import the module of a registered generator"""
+    return importlib.import_module(GENERATORS[name])
+
+
+def matches(name, patterns):
+    """Whether name matches any of the glob patterns (or no pattern is given)"""
+    return not patterns or any(fnmatchcase(name, p) for p in patterns)
+
+
+def select(items, patterns, key=None):
+    """Lazily yield the items whose name matches any of the glob patterns
+
+    Every item is selected when no pattern is given. key extracts the name
+    from an item, e.g. the environment name of an (env, config) pair.
+    """
+    for item in items:
+        if matches(key(item) if key else item, patterns):
+            yield item
+
+
+class EnvironmentFiles:
+    """The files of one TemplateDir, rendered for every layer and environment"""
+
+    def __init__(self, templates, layers=ENVIRONMENT_LAYERS):
+        self.templates = templates
+        self.layers = layers
+
+    def targets(self, environments, envs=(), layers=()):
+        """Every file of the layer x environment matrix, one environment at a time"""
+        selected = list(select(self.layers, layers))
+        for env, config in select(environments, envs, key=lambda item: item[0]):
+            for layer in selected:
+                context = {**config, "layer": layer, "env": env}
+                for filename, template in self.templates.items():
+                    path = f"layers/{layer}/environments/{env}/{filename}"
+                    yield Target(path, render, (template, template.select(context)))
+
+    def claims(self, path, args):
+        """Whether path is one of the files plan(args) generates
+
+        Any environment is claimed without reading the list: in a Pipeline
+        every environment-driven generator renders the same one.
+        """
+        parts = path.split("/")
+        return (len(parts) == 5 and parts[0] == "layers" and parts[2] == "environments"
+                and parts[1] in self.layers and parts[4] in self.templates
+                and matches(parts[1], args.layer) and matches(parts[3], args.env))
+
+    def plan(self, args):
+        if args.inventory:
+            # Rows must set (or inherit) every value the templates read besides layer and env
+            variables = set().union(*(template.variables for template in self.templates.values()))
+            required = sorted(variables - {"layer", "env"})
+            environments = resolve_rows(read_environments(args.inventory), required=required)
+        else:
+            environments = load_environments()
+        return self.targets(environments, args.env, args.layer)
+
+
+class Pipeline:
+    """The targets of several generators as one stream of Targets
+
+    Generators are drained last to first, and a target that a generator
+    drained before claims is skipped. Where two generators produce the
+    same file, the one later in the registry wins, as if they had run one
+    after the other. Claims are worked out from the path alone, so this
+    takes no memory per emitted file. counts holds how many files each
+    generator contributed.
+    """
+
+    def __init__(self, names, args):
+        self.args = args
+        self.generators = {name: load(name) for name in GENERATORS if name in names}
+        self.counts = dict.fromkeys(self.generators, 0)
+
+    def __iter__(self):
+        drained = []
+        for name in reversed(self.generators):
+            module = self.generators[name]
+            for target in module.plan(self.args):
+                if any(claims(target.path, self.args) for claims in drained):
+                    continue
+                self.counts[name] += 1
+                yield target
+            drained.append(module.claims)
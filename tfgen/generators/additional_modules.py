@@ -0,0 +1,38 @@
+"""
+Generate additional essential Terraform modules
+"""
+
+from tfgen.engine import Target
+from tfgen.generators import matches, select
+from tfgen.templates import TemplateSet, render
+
+FILTERS = ("module",)
+INVENTORY = False
+BANNER = "🚀 Generating additional Terraform modules..."
+
+# Module templates live in templates/additional-modules/<module>/<file>.tmpl
+ADDITIONAL_MODULES = TemplateSet("additional-modules")
+
+
+def targets(modules=()):
+    """Every file of every module"""
+    for name in select(ADDITIONAL_MODULES, modules):
+        for filename, template in ADDITIONAL_MODULES[name].items():
+            yield Target(f"modules/{name}/{filename}", render, (template, {}))
+
+
+def claims(path, args):
+    """Whether path is one of the files plan(args) generates"""
+    parts = path.split("/")
+    return (len(parts) == 3 and parts[0] == "modules" and parts[1] in ADDITIONAL_MODULES
+            and parts[2] in ADDITIONAL_MODULES[parts[1]] and matches(parts[1], args.module))
+
+
+def plan(args):
+    return targets(args.module)
+
+
+def report(args, count):
+    for name in select(ADDITIONAL_MODULES, args.module):
+        print(f"  ✅ Created module: {name}")
+    print("\n✅ All additional modules generated successfully!")
@@ -0,0 +1,22 @@
+"""
+Generate backend.conf and terraform.tfvars for all layers and environments
+"""
+
+from tfgen.generators import EnvironmentFiles
+from tfgen.templates import TemplateSet
+
+FILTERS = ("layer", "env")
+INVENTORY = True
+BANNER = None
+
+# backend.conf and terraform.tfvars templates in templates/environment/configs/
+TEMPLATES = TemplateSet("environment")["configs"]
+
+FILES = EnvironmentFiles(TEMPLATES)
+targets = FILES.targets
+claims = FILES.claims
+plan = FILES.plan
+
+
+def report(args, count):
+    print("✅ All environment configuration files generated!")
@@ -0,0 +1,25 @@
+"""
+Generate backend.conf and terraform.tfvars for all layers and environments
+"""
+
+from tfgen.generators import EnvironmentFiles, select
+from tfgen.templates import TemplateSet
+
+FILTERS = ("layer", "env")
+INVENTORY = True
+BANNER = None
+
+# backend.conf and terraform.tfvars templates in templates/environment/env-files/
+TEMPLATES = TemplateSet("environment")["env-files"]
+
+FILES = EnvironmentFiles(TEMPLATES)
+targets = FILES.targets
+claims = FILES.claims
+plan = FILES.plan
+
+
+def report(args, count):
+    print("✅ All environment files generated successfully!")
+    layers = len(list(select(FILES.layers, args.layer)))
+    configs = count // len(TEMPLATES)
+    print(f"Generated files for {layers} layers × {configs // max(layers, 1)} environments = {configs} configs")
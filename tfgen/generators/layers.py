@@ -0,0 +1,39 @@
+"""
+Generate all layer configurations (main.tf, variables.tf, outputs.tf, versions.tf)
+"""
+
+from tfgen.engine import Target
+from tfgen.generators import matches, select
+from tfgen.templates import TemplateSet, render
+
+FILTERS = ("layer",)
+INVENTORY = False
+BANNER = "🚀 Generating layer configurations..."
+
+# Layer templates live in templates/layers/<layer>/<file>.tmpl
+LAYERS_CONFIG = TemplateSet("layers")
+
+
+def targets(layers=()):
+    """Every file of every layer"""
+    for name in select(LAYERS_CONFIG, layers):
+        files = LAYERS_CONFIG[name]
+        for filename, template in files.items():
+            yield Target(f"layers/{name}/{filename}", render, (template, template.select({"layer": name})))
+
+
+def claims(path, args):
+    """Whether path is one of the files plan(args) generates"""
+    parts = path.split("/")
+    return (len(parts) == 3 and parts[0] == "layers" and parts[1] in LAYERS_CONFIG
+            and parts[2] in LAYERS_CONFIG[parts[1]] and matches(parts[1], args.layer))
+
+
+def plan(args):
+    return targets(args.layer)
+
+
+def report(args, count):
+    for name in select(LAYERS_CONFIG, args.layer):
+        print(f"  ✅ Created layer: {name}")
+    print("\n✅ All layers generated successfully!")
@@ -0,0 +1,39 @@
+"""
+Generate complete Terraform enterprise infrastructure
+Creates all remaining modules and layer configurations
+"""
+
+from tfgen.engine import Target
+from tfgen.generators import matches, select
+from tfgen.templates import TemplateSet, render
+
+FILTERS = ("module",)
+INVENTORY = False
+BANNER = "🚀 Generating Terraform modules..."
+
+# Module templates live in templates/modules/<module>/<file>.tmpl
+MODULES = TemplateSet("modules")
+
+
+def targets(modules=()):
+    """Every file of every module"""
+    for name in select(MODULES, modules):
+        for filename, template in MODULES[name].items():
+            yield Target(f"modules/{name}/{filename}", render, (template, {}))
+
+
+def claims(path, args):
+    """Whether path is one of the files plan(args) generates"""
+    parts = path.split("/")
+    return (len(parts) == 3 and parts[0] == "modules" and parts[1] in MODULES
+            and parts[2] in MODULES[parts[1]] and matches(parts[1], args.module))
+
+
+def plan(args):
+    return targets(args.module)
+
+
+def report(args, count):
+    for name in select(MODULES, args.module):
+        print(f"  ✅ Created module: {name}")
+    print("\n✅ All modules generated successfully!")
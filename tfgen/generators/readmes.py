@@ -0,0 +1,37 @@
+"""
+Final validation and creation of missing module READMEs
+"""
+
+from tfgen.engine import Target
+from tfgen.generators import matches, select
+from tfgen.templates import TemplateSet, render
+
+FILTERS = ("module",)
+INVENTORY = False
+BANNER = "🚀 Creating missing module READMEs..."
+
+# README templates live in templates/module-readmes/<module>/README.md.tmpl
+MODULE_READMES = TemplateSet("module-readmes")
+
+
+def targets(modules=()):
+    """README.md of every module"""
+    for name in select(MODULE_READMES, modules):
+        yield Target(f"modules/{name}/README.md", render, (MODULE_READMES[name]["README.md"], {}))
+
+
+def claims(path, args):
+    """Whether path is one of the files plan(args) generates"""
+    parts = path.split("/")
+    return (len(parts) == 3 and parts[0] == "modules" and parts[2] == "README.md"
+            and parts[1] in MODULE_READMES and matches(parts[1], args.module))
+
+
+def plan(args):
+    return targets(args.module)
+
+
+def report(args, count):
+    for name in select(MODULE_READMES, args.module):
+        print(f"  ✅ Created README for {name}")
+    print("\n✅ All module READMEs created!")
@@ -0,0 +1,585 @@
+"""
+In-process HCL2 syntax checker for generated Terraform files
+
+A hand-written lexer and recursive-descent parser for the HCL native
+syntax used by .tf, .tfvars and backend.conf files: bodies of arguments
+and blocks, and the expression grammar (quoted templates and heredocs
+with their interpolations and directives, tuples and objects, for
+expressions, splats, function calls, conditionals and operators). It only
+checks syntax; nothing is evaluated, so no `terraform init`, provider
+download or network access is needed.
+
+parse() returns a light syntax tree: the Body of a file holds its
+Attributes by name (with each expression as source text) and its Blocks.
+"""
+
+import bisect
+import re
+
+# Files the generators produce that are written in HCL native syntax
+SUFFIXES = (".tf", ".tfvars", ".conf")
+
+NEWLINE = "newline"
+IDENT = "ident"
+NUMBER = "number"
+TEMPLATE = "template"
+COMMENT = "comment"
+EOF = "eof"
+
+_TOKEN = re.compile(
+    r"""
+    [ \t\r]*
+    (?:
+    (?P<comment>\#[^\n]*|//[^\n]*|/\*.*?\*/)
+  | (?P<newline>\n)
+  | (?P<heredoc><<-?(?P<marker>[A-Za-z_][A-Za-z0-9_-]*)[ \t]*\r?\n)
+  | (?P<number>[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_-]*)
+  | (?P<string>"(?:[^"\\\n$%]|\\[ntr"\\]|\$(?![{$])|%(?![{%]))*")
+  | (?P<quote>")
+  | (?P<op>\.\.\.|=>|==|!=|<=|>=|&&|\|\||/(?!\*)|[{}\[\]()=,.:?!+\-*%<>~])
+  | (?P<end>\Z)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_SPACE = re.compile(r"[ \t\r]*")
+_ESCAPE = re.compile(r'\\(?:[ntr"\\]|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8})')
+_TEMPLATE_TEXT = re.compile(r'[^"\\$%\n]+')
+_HEREDOC_TEXT = re.compile(r"[^$%\n]+")
+# Binary operator -> precedence
+_BINARY = {
+    "||": 1,
+    "&&": 2,
+    "==": 3, "!=": 3,
+    "<": 4, ">": 4, "<=": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6, "%": 6,
+}
+
+
+class HCLError(ValueError):
+    """A file is not valid HCL"""
+
+    def __init__(self, path, line, col, message):
+        super().__init__(f"{path}:{line}:{col}: {message}")
+        self.path = path
+        self.line = line
+        self.col = col
+        self.message = message
+
+
+class Token:
+    """A token; kind is NEWLINE, IDENT, NUMBER, TEMPLATE, COMMENT, EOF or the operator"""
+
+    __slots__ = ("kind", "value", "pos", "end")
+
+    def __init__(self, kind, value, pos, end):
+        self.kind = kind
+        self.value = value
+        self.pos = pos
+        self.end = end
+
+
+class Attribute:
+    """`name = expr`; expr is the expression's source text"""
+
+    __slots__ = ("name", "expr", "pos")
+
+    def __init__(self, name, expr, pos):
+        self.name = name
+        self.expr = expr
+        self.pos = pos
+
+
+class Block:
+    """`type "label" ... { body }`"""
+
+    __slots__ = ("type", "labels", "body", "pos")
+
+    def __init__(self, type, labels, body, pos):
+        self.type = type
+        self.labels = labels
+        self.body = body
+        self.pos = pos
+
+
+class Body:
+    """The arguments (by name) and nested blocks of a file or block"""
+
+    __slots__ = ("attributes", "blocks")
+
+    def __init__(self):
+        self.attributes = {}
+        self.blocks = []
+
+
+class Source:
+    """HCL source text with its path, for mapping offsets to line:col"""
+
+    def __init__(self, text, path):
+        self.text = text
+        self.path = path
+        self._lines = None
+
+    def location(self, pos):
+        """(line, column) of an offset, both 1-based"""
+        if self._lines is None:
+            self._lines = [0] + [m.end() for m in re.finditer("\n", self.text)]
+        line = bisect.bisect_right(self._lines, pos)
+        return line, pos - self._lines[line - 1] + 1
+
+    def error(self, pos, message):
+        return HCLError(self.path, *self.location(pos), message)
+
+
+def tokenize(source, pos=0, opening=None, comments=False):
+    """Tokens of source.text from pos up to EOF
+
+    With opening (the offset of a ${ or %{) lexing stops at the brace that
+    closes that interpolation; returns (tokens, offset after the brace).
+    With comments, comments are kept as COMMENT tokens.
+    """
+    text = source.text
+    out = []
+    depth = 0
+    match = _TOKEN.match
+    while True:
+        m = match(text, pos)
+        if m is None:
+            pos = _SPACE.match(text, pos).end()
+            if text.startswith("/*", pos):
+                raise source.error(pos, "unterminated comment")
+            if text[pos] == ";":
+                raise source.error(pos, "invalid character ';': HCL separates arguments with newlines")
+            raise source.error(pos, f"invalid character {text[pos]!r}")
+        kind = m.lastgroup
+        pos = m.start(kind)
+        if kind == "op":
+            op = m.group(kind)
+            if op == "{":
+                depth += 1
+            elif op == "}":
+                if depth == 0 and opening is not None:
+                    out.append(Token(EOF, None, pos, pos))
+                    return out, m.end()
+                depth -= 1
+            out.append(Token(op, op, pos, m.end()))
+        elif kind == "ident":
+            out.append(Token(IDENT, m.group(kind), pos, m.end()))
+        elif kind == "newline":
+            out.append(Token(NEWLINE, None, pos, pos + 1))
+        elif kind == "string":
+            # Quoted string without template sequences or unusual escapes
+            out.append(Token(TEMPLATE, (), pos, m.end()))
+        elif kind == "number":
+            out.append(Token(NUMBER, m.group(kind), pos, m.end()))
+        elif kind == "end":
+            if opening is not None:
+                raise source.error(opening, "unclosed template interpolation")
+            out.append(Token(EOF, None, pos, pos))
+            return out, pos
+        elif kind == "quote":
+            parts, end = _quoted(source, m.end())
+            out.append(Token(TEMPLATE, parts, pos, end))
+            pos = end
+            continue
+        elif kind == "heredoc":
+            parts, end = _heredoc(source, m)
+            out.append(Token(TEMPLATE, parts, pos, end - 1))
+            out.append(Token(NEWLINE, None, end - 1, end))
+            pos = end
+            continue
+        elif kind == "comment" and comments:
+            out.append(Token(COMMENT, m.group(kind), pos, m.end()))
+        elif kind == "comment" and opening is None and "\n" in m.group(kind):
+            out.append(Token(NEWLINE, None, pos, m.end()))
+        pos = m.end()
+
+
+def _quoted(source, pos):
+    """Interpolations of a quoted template that starts at pos"""
+    text = source.text
+    parts = []
+    while True:
+        m = _TEMPLATE_TEXT.match(text, pos)
+        if m:
+            pos = m.end()
+        if pos >= len(text) or text[pos] == "\n":
+            raise source.error(pos, "unterminated string")
+        c = text[pos]
+        if c == '"':
+            return parts, pos + 1
+        if c == "\\":
+            m = _ESCAPE.match(text, pos)
+            if m is None:
+                raise source.error(pos, f"invalid escape sequence {text[pos:pos + 2]!r}")
+            pos = m.end()
+        else:
+            pos = _sequence(source, pos, parts)
+
+
+def _heredoc(source, match):
+    """Interpolations of a heredoc; returns (parts, offset after its end marker)"""
+    text = source.text
+    marker = match.group("marker")
+    pos = match.end()
+    parts = []
+    while True:
+        # pos is at the start of a line
+        end = text.find("\n", pos)
+        if end < 0:
+            end = len(text)
+        if text[pos:end].strip() == marker:
+            return parts, min(end + 1, len(text))
+        if end == len(text):
+            raise source.error(match.start(), f"unterminated heredoc, expected {marker!r}")
+        while pos < end:
+            m = _HEREDOC_TEXT.match(text, pos)
+            if m:
+                pos = min(m.end(), end)
+                continue
+            pos = _sequence(source, pos, parts)
+        pos = end + 1
+
+
+def _sequence(source, pos, parts):
+    """Lex a ${...} or %{...} at pos into parts; return the offset after it"""
+    text = source.text
+    if text.startswith(("$${", "%%{"), pos):
+        return pos + 3
+    if not text.startswith(("${", "%{"), pos):
+        return pos + 1
+    start = pos + 2
+    if text.startswith("~", start):
+        start += 1
+    tokens, end = tokenize(source, start, opening=pos)
+    if len(tokens) > 1 and tokens[-2].kind == "~":
+        del tokens[-2]
+    parts.append((text[pos] == "%", tokens, pos))
+    return end
+
+
+class Parser:
+    """Recursive-descent parser over the tokens of a Source"""
+
+    def __init__(self, source, tokens, multiline=False):
+        self.source = source
+        self.tokens = tokens
+        self.pos = 0
+        # Newlines are insignificant inside parentheses and brackets
+        self.multiline = [multiline]
+
+    def error(self, token, message):
+        return self.source.error(token.pos, message)
+
+    def peek(self):
+        token = self.tokens[self.pos]
+        if self.multiline[-1]:
+            while token.kind == NEWLINE:
+                self.pos += 1
+                token = self.tokens[self.pos]
+        return token
+
+    def next(self):
+        token = self.peek()
+        if token.kind != EOF:
+            self.pos += 1
+        return token
+
+    def at(self, value):
+        token = self.peek()
+        return token.value == value and token.kind != TEMPLATE
+
+    def expect(self, value, context):
+        token = self.next()
+        if token.value != value or token.kind == TEMPLATE:
+            raise self.error(token, f"expected {value!r} {context}, found {describe(token)}")
+        return token
+
+    def skip_newlines(self):
+        while self.tokens[self.pos].kind == NEWLINE:
+            self.pos += 1
+
+    # Structure
+
+    def body(self, opening=None):
+        """Arguments and blocks up to EOF or the brace closing opening"""
+        body = Body()
+        while True:
+            self.skip_newlines()
+            token = self.tokens[self.pos]
+            if token.kind == EOF:
+                if opening is not None:
+                    raise self.error(opening, "unclosed block")
+                return body
+            if token.kind == "}" and opening is not None:
+                return body
+            if token.kind != IDENT:
+                raise self.error(token, f"expected an argument or block, found {describe(token)}")
+            self.pos += 1
+            if self.tokens[self.pos].kind == "=":
+                self.pos += 1
+                self.attribute(body, token)
+                self.end_of_line("argument")
+            else:
+                body.blocks.append(self.block(token))
+
+    def attribute(self, body, name):
+        if name.value in body.attributes:
+            raise self.error(name, f"argument {name.value!r} is already set")
+        start = self.peek().pos
+        self.expression()
+        expr = self.source.text[start:self.tokens[self.pos - 1].end].strip()
+        body.attributes[name.value] = Attribute(name.value, expr, name.pos)
+
+    def block(self, name):
+        labels = []
+        while True:
+            token = self.tokens[self.pos]
+            if token.kind == TEMPLATE and token.value:
+                raise self.error(token, "block labels cannot contain template sequences")
+            if token.kind == IDENT:
+                labels.append(token.value)
+            elif token.kind == TEMPLATE:
+                labels.append(self.source.text[token.pos + 1:token.end - 1])
+            else:
+                break
+            self.pos += 1
+        opening = self.expect("{", f"to open block {name.value!r}")
+        if self.tokens[self.pos].kind == NEWLINE:
+            body = self.body(opening)
+            self.pos += 1
+        else:
+            # A single-line block holds at most one argument: variable "x" { type = string }
+            body = Body()
+            if self.tokens[self.pos].kind != "}":
+                argument = self.next()
+                if argument.kind != IDENT:
+                    raise self.error(argument, f"expected an argument, found {describe(argument)}")
+                self.expect("=", "in single-line block")
+                self.attribute(body, argument)
+                token = self.tokens[self.pos]
+                if token.kind != "}":
+                    raise self.error(token, "a single-line block may only hold one argument, "
+                                            f"found {describe(token)}")
+            self.pos += 1
+        self.end_of_line("block")
+        return Block(name.value, labels, body, name.pos)
+
+    def end_of_line(self, what):
+        token = self.tokens[self.pos]
+        if token.kind == NEWLINE:
+            self.pos += 1
+        elif token.kind != EOF:
+            raise self.error(token, f"expected a newline after {what}, found {describe(token)}")
+
+    # Expressions
+
+    def expression(self):
+        self.binary(0)
+        if self.peek().kind == "?":
+            self.pos += 1
+            self.expression()
+            self.expect(":", "in conditional expression")
+            self.expression()
+
+    def binary(self, precedence):
+        """Operands joined by binary operators binding tighter than precedence"""
+        self.unary()
+        while True:
+            bound = _BINARY.get(self.peek().kind)
+            if bound is None or bound <= precedence:
+                return
+            self.pos += 1
+            self.binary(bound)
+
+    def unary(self):
+        while self.peek().kind in ("!", "-"):
+            self.pos += 1
+        self.primary()
+        self.postfix()
+
+    def postfix(self):
+        while True:
+            token = self.tokens[self.pos]
+            if token.kind == ".":
+                self.pos += 1
+                name = self.tokens[self.pos]
+                if name.kind not in (IDENT, NUMBER, "*"):
+                    raise self.error(name, f"expected an attribute name after '.', found {describe(name)}")
+                self.pos += 1
+            elif token.kind == "[":
+                self.pos += 1
+                self.multiline.append(True)
+                if self.at("*"):
+                    self.pos += 1
+                else:
+                    self.expression()
+                self.expect("]", "to close index")
+                self.multiline.pop()
+            else:
+                return
+
+    def primary(self):
+        token = self.next()
+        kind = token.kind
+        if kind == IDENT:
+            if self.tokens[self.pos].kind == "(":
+                self.pos += 1
+                self.call(token)
+        elif kind == NUMBER:
+            pass
+        elif kind == TEMPLATE:
+            self.template(token)
+        elif kind == "(":
+            self.multiline.append(True)
+            self.expression()
+            self.expect(")", "to close parenthesis")
+            self.multiline.pop()
+        elif kind == "[":
+            self.tuple(token)
+        elif kind == "{":
+            self.object(token)
+        else:
+            raise self.error(token, f"expected an expression, found {describe(token)}")
+
+    def call(self, name):
+        self.multiline.append(True)
+        while not self.at(")"):
+            self.expression()
+            if self.at("..."):
+                self.pos += 1
+                break
+            if not self.at(","):
+                break
+            self.pos += 1
+        self.expect(")", f"to close call to {name.value}()")
+        self.multiline.pop()
+
+    def tuple(self, opening):
+        self.multiline.append(True)
+        if self.at("for"):
+            self.for_expression(object_result=False)
+        else:
+            while not self.at("]"):
+                if self.peek().kind == EOF:
+                    raise self.error(opening, "unclosed tuple")
+                self.expression()
+                if not self.at(","):
+                    break
+                self.pos += 1
+        self.expect("]", "to close tuple")
+        self.multiline.pop()
+
+    def object(self, opening):
+        self.multiline.append(False)
+        self.skip_newlines()
+        if self.at("for"):
+            self.multiline[-1] = True
+            self.for_expression(object_result=True)
+        else:
+            while True:
+                self.skip_newlines()
+                token = self.tokens[self.pos]
+                if token.kind == "}":
+                    break
+                if token.kind == EOF:
+                    raise self.error(opening, "unclosed object")
+                self.expression()
+                token = self.next()
+                if token.kind not in ("=", ":"):
+                    raise self.error(token, f"expected '=' or ':' after object key, found {describe(token)}")
+                self.expression()
+                token = self.tokens[self.pos]
+                if token.kind in (",", NEWLINE):
+                    self.pos += 1
+                elif token.kind != "}":
+                    raise self.error(token, f"expected ',' or a newline between object items, "
+                                            f"found {describe(token)}")
+        self.skip_newlines()
+        self.expect("}", "to close object")
+        self.multiline.pop()
+
+    def for_expression(self, object_result):
+        self.pos += 1
+        self.for_variables()
+        self.expression()
+        self.expect(":", "in for expression")
+        self.expression()
+        if object_result:
+            self.expect("=>", "in object for expression")
+            self.expression()
+            if self.at("..."):
+                self.pos += 1
+        if self.at("if"):
+            self.pos += 1
+            self.expression()
+
+    def for_variables(self):
+        """`k, v in` or `v in` of a for expression or directive"""
+        for _ in range(2):
+            name = self.next()
+            if name.kind != IDENT:
+                raise self.error(name, f"expected a variable name in for, found {describe(name)}")
+            if not self.at(","):
+                break
+            self.pos += 1
+        self.expect("in", "in for")
+
+    # Templates
+
+    def template(self, token):
+        """Check the interpolations and directives of a template token"""
+        stack = []
+        for directive, tokens, start in token.value:
+            sub = Parser(self.source, tokens, multiline=True)
+            if not directive:
+                sub.expression()
+            else:
+                keyword = sub.next()
+                word = keyword.value if keyword.kind == IDENT else None
+                if word == "if":
+                    sub.expression()
+                    stack.append(("if", start))
+                elif word == "for":
+                    sub.for_variables()
+                    sub.expression()
+                    stack.append(("for", start))
+                elif word == "else":
+                    if not stack or stack[-1][0] != "if":
+                        raise self.source.error(start, "%{ else } without a matching %{ if }")
+                elif word in ("endif", "endfor"):
+                    if not stack or stack[-1][0] != word[3:]:
+                        raise self.source.error(start, f"%{{ {word} }} without a matching %{{ {word[3:]} }}")
+                    stack.pop()
+                else:
+                    raise self.error(keyword, f"unknown template directive {describe(keyword)}")
+            end = sub.peek()
+            if end.kind != EOF:
+                raise self.error(end, f"unexpected {describe(end)} in template interpolation")
+        if stack:
+            raise self.source.error(stack[-1][1], f"unclosed %{{ {stack[-1][0]} }} directive")
+
+
+def describe(token):
+    """How a token is named in error messages"""
+    if token.kind == EOF:
+        return "end of file"
+    if token.kind == NEWLINE:
+        return "newline"
+    if token.kind == TEMPLATE:
+        return "string"
+    return repr(token.value)
+
+
+def parse(text, path="<hcl>"):
+    """Parse text into its top-level Body, raising HCLError on syntax errors"""
+    source = Source(text, path)
+    tokens, _ = tokenize(source)
+    return Parser(source, tokens).body()
+
+
+def is_hcl(path):
+    """True for generated files written in HCL native syntax"""
+    return path.endswith(SUFFIXES)
@@ -0,0 +1,269 @@
+"""
+Module interface index: the variables and outputs of every module
+
+Parses modules/<name>/variables.tf and outputs.tf into a symbol table of
+each module's inputs (name, type, default, whether it is required) and
+outputs. Interfaces are persisted in .tfgen-cache/modules.json and
+invalidated per module by the digest of those two files, so a run only
+re-parses the modules that changed.
+
+The index lets `module "..."` calls in generated files be checked against
+the module they call (unknown and missing required arguments) with a
+lookup instead of a `terraform init` + `terraform validate` round trip
+per layer. The index reads the modules on disk in the base dir; modules
+rendered in the same run are checked against their previous version.
+Calls to a module whose interface files do not parse are not checked,
+since the run may be about to regenerate them.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+
+from tfgen import hcl
+from tfgen.validate import CACHE_DIR
+
+INDEX_FILE = "modules.json"
+VERSION = 1
+INTERFACE_FILES = ("variables.tf", "outputs.tf")
+
+# Arguments every module call accepts besides the module's variables
+META_ARGUMENTS = frozenset(["source", "version", "count", "for_each", "providers", "depends_on"])
+
+# Local module sources whose last two components are modules/<name>
+_LOCAL_SOURCE = re.compile(r'^"\.{1,2}/(?:[^"]*/)?modules/([A-Za-z0-9_-]+)/?"$')
+
+
+@dataclass(frozen=True)
+class Variable:
+    """An input variable; type and default are HCL source text"""
+
+    name: str
+    type: str = None
+    default: str = None
+    description: str = None
+    required: bool = True
+
+
+@dataclass(frozen=True)
+class Output:
+    name: str
+    description: str = None
+    sensitive: bool = False
+
+
+@dataclass(frozen=True)
+class ModuleInterface:
+    """Variables and outputs of one module, with the digest they were read at
+
+    error is why the interface files could not be parsed, if they could not.
+    """
+
+    name: str
+    digest: str
+    variables: dict = field(default_factory=dict)
+    outputs: dict = field(default_factory=dict)
+    error: str = None
+
+    @property
+    def required(self):
+        """Names of the variables a caller must set"""
+        return sorted(name for name, variable in self.variables.items() if variable.required)
+
+    def to_json(self):
+        return {
+            "digest": self.digest,
+            "variables": [asdict(v) for v in self.variables.values()],
+            "outputs": [asdict(o) for o in self.outputs.values()],
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_json(cls, name, data):
+        return cls(
+            name,
+            data["digest"],
+            {v["name"]: Variable(**v) for v in data["variables"]},
+            {o["name"]: Output(**o) for o in data["outputs"]},
+            data.get("error"),
+        )
+
+
+def _string(attribute):
+    """Value of a plain quoted string attribute, or its source text"""
+    if attribute is None:
+        return None
+    text = attribute.expr
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+def read_interface(name, module_dir, digest):
+    """Parse a module's variables.tf and outputs.tf into a ModuleInterface
+
+    A file that does not parse gives an interface with just its error.
+    """
+    interface = ModuleInterface(name, digest)
+    for filename in INTERFACE_FILES:
+        path = os.path.join(module_dir, filename)
+        try:
+            with open(path, encoding="utf-8") as f:
+                body = hcl.parse(f.read(), path)
+        except FileNotFoundError:
+            continue
+        except hcl.HCLError as e:
+            return ModuleInterface(name, digest, error=str(e))
+        for block in body.blocks:
+            if len(block.labels) != 1:
+                continue
+            attributes = block.body.attributes
+            if block.type == "variable":
+                default = attributes.get("default")
+                interface.variables[block.labels[0]] = Variable(
+                    block.labels[0],
+                    type=attributes["type"].expr if "type" in attributes else None,
+                    default=default.expr if default else None,
+                    description=_string(attributes.get("description")),
+                    required=default is None,
+                )
+            elif block.type == "output":
+                sensitive = attributes.get("sensitive")
+                interface.outputs[block.labels[0]] = Output(
+                    block.labels[0],
+                    description=_string(attributes.get("description")),
+                    sensitive=sensitive is not None and sensitive.expr == "true",
+                )
+    return interface
+
+
+def module_digest(module_dir):
+    """Digest of a module's interface files, or None if it has neither"""
+    h = hashlib.sha256()
+    found = False
+    for filename in INTERFACE_FILES:
+        try:
+            with open(os.path.join(module_dir, filename), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            continue
+        found = True
+        h.update(f"{filename}\0{len(data)}\0".encode("utf-8"))
+        h.update(data)
+    return h.hexdigest() if found else None
+
+
+class ModuleIndex(Mapping):
+    """Lazy mapping of module name -> ModuleInterface over <base_dir>/modules/
+
+    Without a base dir the index is empty.
+    """
+
+    def __init__(self, base_dir):
+        self.modules_dir = os.path.join(base_dir, "modules") if base_dir is not None else None
+        self.path = os.path.join(base_dir, CACHE_DIR, INDEX_FILE) if base_dir is not None else None
+        self._interfaces = {}
+        self._cached = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Persisted interfaces by module name; caller must hold the lock"""
+        if self._cached is None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (FileNotFoundError, ValueError):
+                data = {}
+            self._cached = data.get("modules", {}) if data.get("version") == VERSION else {}
+        return self._cached
+
+    def _names(self):
+        if self.modules_dir is None:
+            return []
+        try:
+            return sorted(entry.name for entry in os.scandir(self.modules_dir) if entry.is_dir())
+        except FileNotFoundError:
+            return []
+
+    def __getitem__(self, name):
+        with self._lock:
+            interface = self._interfaces.get(name)
+            if interface is not None:
+                return interface
+            if self.modules_dir is None:
+                raise KeyError(name)
+            module_dir = os.path.join(self.modules_dir, name)
+            digest = module_digest(module_dir)
+            if digest is None:
+                raise KeyError(name)
+            cached = self._load().get(name)
+            if cached is not None and cached["digest"] == digest:
+                interface = ModuleInterface.from_json(name, cached)
+            else:
+                interface = read_interface(name, module_dir, digest)
+                self._cached[name] = interface.to_json()
+                self._dirty = True
+            self._interfaces[name] = interface
+            return interface
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+    @functools.cached_property
+    def digest(self):
+        """Digest over every module's interface, for caching check results"""
+        h = hashlib.sha256()
+        for name in self:
+            interface = self.get(name)
+            if interface is not None:
+                h.update(f"{name}\0{interface.digest}\0".encode("utf-8"))
+        return h.hexdigest()
+
+    def resolve(self, source):
+        """Module name a `source = "..."` expression points at, if indexed"""
+        m = _LOCAL_SOURCE.match(source)
+        if m is None or m.group(1) not in self:
+            return None
+        return m.group(1)
+
+    def check_calls(self, body):
+        """Yield (offset, message) for every bad argument of a module call in body"""
+        for block in body.blocks:
+            if block.type != "module" or "source" not in block.body.attributes:
+                continue
+            name = self.resolve(block.body.attributes["source"].expr)
+            if name is None:
+                continue
+            interface = self[name]
+            if interface.error is not None:
+                continue
+            label = block.labels[0] if block.labels else "?"
+            arguments = block.body.attributes
+            for argument in arguments.values():
+                if argument.name not in META_ARGUMENTS and argument.name not in interface.variables:
+                    yield argument.pos, (f"module {label!r}: unknown argument {argument.name!r} "
+                                         f"(modules/{name} has no such variable)")
+            for required in interface.required:
+                if required not in arguments:
+                    yield block.pos, f"module {label!r}: missing required argument {required!r} of modules/{name}"
+
+    def save(self):
+        """Persist interfaces parsed during this run"""
+        with self._lock:
+            if not self._dirty or self.path is None:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.tmp", "w") as f:
+                json.dump({"version": VERSION, "modules": self._cached}, f, indent=1, sort_keys=True)
+                f.write("\n")
+            os.replace(f"{self.path}.tmp", self.path)
+            self._dirty = False
@@ -0,0 +1,93 @@
+"""
+Streaming environment inventories
+
+Large fleets are described by an NDJSON (.ndjson/.jsonl) or CSV inventory
+with one account/region/environment per row instead of environments.toml. Rows are read lazily, one at a time, so generation
+memory does not grow with the size of the fleet.
+
+Each row needs a "name" (or "env") column, used as the environment
+directory name; the remaining columns form the environment config, with
+values rendered the way the generators expect them (strings, lowercase
+booleans, HCL lists). Rows inherit from the environment model like the
+environments in environments.toml do (see tfgen.environments), so a row
+with a "tier" only needs the values that differ from it.
+
+A file that cannot be read, or a row that is invalid, raises
+InventoryError naming the inventory and the row's line.
+"""
+
+import csv
+import json
+import os
+
+
+def hcl_value(value):
+    """A config value as the generators render it: lowercase booleans, HCL lists"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+class InventoryError(ValueError):
+    """An inventory that cannot be read, or a row of it that is invalid"""
+
+    def __init__(self, path, line, message):
+        super().__init__(f"{path}:{line}: {message}" if line is not None else f"{path}: {message}")
+        self.path = path
+        self.line = line
+
+
+def _environment(row, source, line):
+    if not isinstance(row, dict):
+        raise InventoryError(source, line, "row is not an object")
+    row = dict(row)
+    name = row.pop("name", None)
+    alias = row.pop("env", None)
+    name = name or alias
+    if not name:
+        raise InventoryError(source, line, "row has no 'name' or 'env' column")
+    return name, {key: hcl_value(value) for key, value in row.items()}
+
+
+class Inventory:
+    """The (name, config) environment rows of an inventory, read lazily
+
+    line is the line of the row read last, for errors about it (see
+    error()).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.line = None
+
+    def __iter__(self):
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext not in (".csv", ".ndjson", ".jsonl"):
+            raise InventoryError(self.path, None, "unsupported inventory format (use .ndjson, .jsonl or .csv)")
+        try:
+            f = open(self.path, newline="")
+        except OSError as e:
+            raise InventoryError(self.path, None, e.strerror) from None
+        with f:
+            if ext == ".csv":
+                for self.line, row in enumerate(csv.DictReader(f), start=2):
+                    yield _environment(row, self.path, self.line)
+            else:
+                for self.line, text in enumerate(f, start=1):
+                    if text.strip():
+                        try:
+                            row = json.loads(text)
+                        except json.JSONDecodeError as e:
+                            raise self.error(f"invalid JSON: {e.msg} (column {e.colno})") from None
+                        yield _environment(row, self.path, self.line)
+
+    def error(self, message):
+        """InventoryError about the row read last"""
+        return InventoryError(self.path, self.line, message)
+
+
+def read_environments(path):
+    """(name, config) of every environment row of an inventory, as an Inventory"""
+    return Inventory(path)
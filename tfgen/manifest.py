@@ -0,0 +1,147 @@
+"""
+Persisted generation manifest (.genstate/)
+
+The manifest maps every generated file to a digest of the exact inputs it
+was rendered from (the renderer's code plus the arguments it was called
+with, e.g. one environment config or one LAYERS_CONFIG template) and to
+the size and mtime the file had after it was written. A later run only
+re-renders targets whose inputs changed or whose file was modified on
+disk since; everything else is left alone without being rendered.
+
+Entries are sharded by output directory and mirror the generated tree,
+e.g. .genstate/layers/dns/environments/prod.json holds the entries of
+layers/dns/environments/prod/. Only a bounded number of shards is kept in
+memory, so the manifest stays small however large the fleet is.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+MANIFEST_DIR = ".genstate"
+VERSION = 1
+CACHED_SHARDS = 256
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=None)
+def fingerprint(func):
+    """Digest of a renderer's bytecode and constants (its template text)"""
+    h = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode("utf-8"))
+    _hash_code(h, func.__code__)
+    return h.hexdigest()
+
+
+def input_key(target):
+    """Digest of everything a target's content is derived from"""
+    h = hashlib.sha256(fingerprint(target.render).encode("utf-8"))
+    h.update(json.dumps(target.args, sort_keys=True, default=repr).encode("utf-8"))
+    return h.hexdigest()
+
+
+class _Shard:
+    def __init__(self, path, files):
+        self.path = path
+        self.files = files
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls(path, {})
+        if data.get("version") != VERSION:
+            return cls(path, {})
+        return cls(path, data.get("files", {}))
+
+    def save(self):
+        if not self.dirty or self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": VERSION, "files": self.files}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class Manifest:
+    """Output path -> inputs digest, content digest and file stat"""
+
+    def __init__(self, base_dir, cached_shards=CACHED_SHARDS):
+        # Without a base dir the manifest lives in memory only
+        self.root = os.path.join(base_dir, MANIFEST_DIR) if base_dir is not None else None
+        self.cached_shards = cached_shards
+        self._shards = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, base_dir):
+        return cls(base_dir)
+
+    def _shard(self, rel_path):
+        """Shard holding rel_path's entry; caller must hold the lock"""
+        directory, name = os.path.split(rel_path)
+        shard = self._shards.get(directory)
+        if shard is None:
+            if self.root is None:
+                shard = _Shard(None, {})
+            else:
+                shard = _Shard.load(os.path.join(self.root, f"{directory}.json"))
+            self._shards[directory] = shard
+            while len(self._shards) > self.cached_shards:
+                self._shards.popitem(last=False)[1].save()
+        else:
+            self._shards.move_to_end(directory)
+        return shard, name
+
+    def get(self, rel_path):
+        """Manifest entry of rel_path, or None"""
+        with self._lock:
+            shard, name = self._shard(rel_path)
+            return shard.files.get(name)
+
+    def is_fresh(self, rel_path, key, abs_path):
+        """True if rel_path was rendered from key and is untouched on disk"""
+        entry = self.get(rel_path)
+        if entry is None or entry["inputs"] != key:
+            return False
+        try:
+            st = os.stat(abs_path)
+        except FileNotFoundError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+
+    def record(self, rel_path, key, content_digest, abs_path):
+        st = os.stat(abs_path)
+        entry = {
+            "inputs": key,
+            "digest": content_digest,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        with self._lock:
+            shard, name = self._shard(rel_path)
+            shard.files[name] = entry
+            shard.dirty = True
+
+    def save(self):
+        """Flush every modified shard to disk"""
+        with self._lock:
+            for shard in self._shards.values():
+                shard.save()
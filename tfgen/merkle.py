@@ -0,0 +1,122 @@
+"""
+Merkle trees over generated output for fast "is the tree in sync?" checks
+
+Two trees are built over the files a generator produces, e.g. everything
+under layers/*/environments/* or modules/*:
+
+  expected  content digests the generator inputs would produce
+  actual    content digests of the files on disk
+
+Neither needs a full regeneration. A target whose input key matches the
+generation manifest takes its expected digest from the manifest; only
+targets whose inputs changed are rendered (in memory). A file whose size
+and mtime match the manifest takes its actual digest from the manifest;
+only files touched since the last run are read and hashed.
+
+Each directory's hash covers the sorted names and hashes of its children,
+so comparing the two trees top-down points at the exact stale subtrees.
+The expected tree's root hash identifies the generated tree, e.g. as a CI
+cache key. Building the trees reads the manifest but writes nothing.
+"""
+
+import hashlib
+import os
+
+from tfgen.engine import execute
+from tfgen.manifest import Manifest, input_key
+from tfgen.writer import digest
+
+
+class MerkleTree:
+    """Nested directories of file digests with memoized directory hashes"""
+
+    def __init__(self):
+        self.root = {}
+        self._hashes = {}
+
+    def add(self, rel_path, leaf):
+        node = self.root
+        parts = rel_path.split("/")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = leaf
+        self._hashes.clear()
+
+    def hash(self, node=None):
+        """Hash of a directory node (the whole tree by default)"""
+        node = self.root if node is None else node
+        cached = self._hashes.get(id(node))
+        if cached is None:
+            h = hashlib.sha256()
+            for name in sorted(node):
+                child = node[name]
+                if child is None:
+                    continue
+                h.update(name.encode("utf-8") + b"\0")
+                h.update((self.hash(child) if isinstance(child, dict) else child).encode("utf-8"))
+            cached = self._hashes[id(node)] = h.hexdigest()
+        return cached
+
+
+def _hash_file(path):
+    try:
+        with open(path, "rb") as f:
+            return digest(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _leaves(base_dir, target, manifest):
+    """(expected digest, actual digest) of a target"""
+    path = os.path.join(base_dir, target.path)
+    entry = manifest.get(target.path)
+    if entry is not None and entry["inputs"] == input_key(target):
+        expected = entry["digest"]
+    else:
+        expected = digest(target.build().encode("utf-8"))
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return expected, None
+    if entry is not None and st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+        return expected, entry["digest"]
+    return expected, _hash_file(path)
+
+
+def build(targets, base_dir, jobs=1):
+    """Build the (expected, actual) Merkle trees of targets"""
+    manifest = Manifest.load(base_dir)
+    expected, actual = MerkleTree(), MerkleTree()
+
+    def work(target):
+        return target.path, _leaves(base_dir, target, manifest)
+
+    for rel_path, (want, have) in execute(targets, work, jobs):
+        expected.add(rel_path, want)
+        actual.add(rel_path, have)
+    return expected, actual
+
+
+def stale_subtrees(expected, actual):
+    """Yield (directory, stale file names) of every directory out of sync
+
+    Only directories that directly hold stale files are reported, so the
+    result points at the smallest subtrees to regenerate or inspect.
+    """
+
+    def walk(want, have, prefix):
+        if expected.hash(want) == actual.hash(have):
+            return
+        stale = []
+        for name in sorted(want):
+            child, other = want[name], have.get(name)
+            if isinstance(child, dict):
+                yield from walk(child, other or {}, f"{prefix}{name}/")
+            elif child != other:
+                stale.append(name)
+        if stale:
+            yield prefix.rstrip("/") or ".", stale
+
+    yield from walk(expected.root, actual.root, "")
+
@@ -0,0 +1,138 @@
+"""
+Opt-in profiling of generation runs (--profile)
+
+While a Profiler is active, the engine and the layers below it record
+spans for every phase of every file:
+
+    file        one target, from the manifest check to the write
+    manifest    checking whether the target's inputs changed
+    render      building the content, including:
+      template    rendering one template or fragment
+      format      laying out HCL (tfgen.fmt)
+      load        reading a template file
+      compile     compiling it into a Python function
+    hash        digesting the rendered content
+    validate    parsing the content and checking module calls
+    compare     comparing the content with the file on disk
+    mkdir       creating output directories
+    write       writing (or staging) the file
+    commit      moving staged files into place
+    fsync       flushing the filesystem and directories
+
+Spans are streamed to a Chrome trace file (chrome://tracing or Perfetto)
+as they end, so profiling a fleet-sized run does not hold every event in
+memory; only per-phase, per-template and per-directory totals are kept
+for the summary table.
+
+span() is a no-op while no profiler is active, so the instrumentation
+stays in place at negligible cost.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_TRACE = "tfgen-profile.json"
+
+_NULL = contextlib.nullcontext()
+_active = None
+
+
+class Profiler:
+    """Writes spans to a Chrome trace file and totals them for summary()"""
+
+    def __init__(self, path):
+        self.path = path
+        self.phases = {}
+        self.templates = {}
+        self.directories = {}
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._file = open(path, "w")
+        self._file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._separator = ""
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter_ns(), args)
+
+    def _record(self, name, start, end, args):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self._pid,
+            "tid": threading.get_native_id(),
+        }
+        if args:
+            event["args"] = args
+        line = json.dumps(event, separators=(",", ":"))
+        seconds = (end - start) / 1e9
+        with self._lock:
+            self._file.write(self._separator + line)
+            self._separator = ",\n"
+            _add(self.phases, name, seconds)
+            if name == "template":
+                _add(self.templates, args["template"], seconds)
+            elif name == "file":
+                _add(self.directories, os.path.dirname(args["path"]), seconds)
+
+    def close(self):
+        with self._lock:
+            self._file.write("\n]}\n")
+            self._file.close()
+
+    def summary(self, limit=10):
+        """Lines of a table of every phase and the `limit` slowest templates and directories"""
+        lines = []
+        tables = (("phase", self.phases, None), ("template", self.templates, limit),
+                  ("directory", self.directories, limit))
+        for title, totals, shown in tables:
+            if not totals:
+                continue
+            slowest = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:shown]
+            width = max(len(title), *(len(key) for key, _ in slowest))
+            lines.append(f"  {title:<{width}}  {'total':>10}  {'count':>7}  {'mean':>9}")
+            for key, (seconds, count) in slowest:
+                lines.append(f"  {key:<{width}}  {seconds * 1000:>8.1f}ms  {count:>7}  {seconds / count * 1e6:>7.0f}µs")
+            lines.append("")
+        return lines[:-1]
+
+
+def _add(totals, key, seconds):
+    entry = totals.get(key)
+    if entry is None:
+        totals[key] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def start(path=DEFAULT_TRACE):
+    """Start recording spans into a Chrome trace at path"""
+    global _active
+    _active = Profiler(path)
+    return _active
+
+
+def stop():
+    """Stop recording; return the Profiler, with its trace file complete"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.close()
+    return profiler
+
+
+def span(name, **args):
+    """Context manager timing one phase, if a profiler is active"""
+    profiler = _active
+    return _NULL if profiler is None else profiler.span(name, **args)
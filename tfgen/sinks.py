@@ -0,0 +1,295 @@
+"""
+Output sinks: where the engine puts rendered files
+
+A sink receives every rendered file of a run and settles it at the end:
+
+    write(rel_path, data, content_digest) -> (status, path)
+    commit()    every target rendered (and validated) successfully
+    abort()     the run failed or was interrupted
+
+status is CREATED, WRITTEN or SKIPPED (content already there). path is
+the file on disk to stat for the generation manifest, or None when the
+sink keeps nothing in the base dir; such files are not recorded in the
+manifest.
+
+    Transaction     the base dir, staged and committed atomically
+                    (the default, see tfgen.transaction)
+    InPlaceWriter   the base dir, each file written as it is rendered
+                    (--in-place, see tfgen.writer)
+    MemorySink      a dict of rel_path -> bytes; nothing touches the disk
+    TarSink         a tar archive (.tar, .tar.gz, .tgz) of every file
+    BundleSink      one reproducible archive per environment directory
+                    (--bundle), named after its content hash
+    DiffSink        compares with the base dir and keeps only the files
+                    that would change (--dry-run); writes nothing
+
+A sink that starts empty (MemorySink, TarSink, BundleSink) needs every target, so
+runs into one pass an in-memory Manifest(None) to run(); with base_dir
+None as well, the validation cache and module index stay in memory too
+and nothing touches the disk.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+
+from tfgen.writer import CREATED, SKIPPED, WRITTEN, changed_status
+
+BUNDLE_FORMATS = ("tar.gz", "zip")
+BUNDLE_INDEX = "index.json"
+# Every bundle entry gets this mtime (1980-01-01, the earliest a zip can hold) and mode
+BUNDLE_MTIME = 315532800
+BUNDLE_MODE = 0o644
+
+# Files of one environment are bundled together; any other file is
+# bundled with the rest of its directory
+_ENVIRONMENT = re.compile(r"^layers/[^/]+/environments/[^/]+$")
+
+
+class MemorySink:
+    """In-memory file tree: relative path -> bytes
+
+    Files written during a run are only added to files on commit, so a
+    failed run leaves the tree as it was, like a Transaction on disk.
+    """
+
+    def __init__(self, files=None):
+        self.files = {} if files is None else files
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def write(self, rel_path, data, content_digest=None):
+        with self._lock:
+            current = self._pending.get(rel_path, self.files.get(rel_path))
+            if current is None:
+                status = CREATED
+            elif current == data:
+                return SKIPPED, None
+            else:
+                status = WRITTEN
+            self._pending[rel_path] = data
+        return status, None
+
+    def commit(self):
+        with self._lock:
+            self.files.update(self._pending)
+            self._pending.clear()
+
+    def abort(self):
+        with self._lock:
+            self._pending.clear()
+
+    def __len__(self):
+        return len(self.files)
+
+
+class TarSink:
+    """Streams every rendered file into a tar archive at path
+
+    The archive is written next to path and renamed into place on commit;
+    compression follows the suffix (.tar.gz/.tgz gzip, otherwise none).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mode = "w:gz" if path.endswith((".tar.gz", ".tgz")) else "w"
+        self._tmp = f"{path}.tmp"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._tar = tarfile.open(self._tmp, self.mode)
+        self._mtime = int(time.time())
+        self._lock = threading.Lock()
+
+    def write(self, rel_path, data, content_digest=None):
+        info = tarfile.TarInfo(rel_path)
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        with self._lock:
+            self._tar.addfile(info, io.BytesIO(data))
+        return CREATED, None
+
+    def commit(self):
+        self._tar.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._tar.close()
+        try:
+            os.remove(self._tmp)
+        except FileNotFoundError:
+            pass
+
+
+class DiffSink:
+    """Keeps the files that differ from the base dir in memory; writes nothing
+
+    changes lists (status, rel_path) of files that would be created or
+    rewritten and files holds their content.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.files = {}
+        self._statuses = {}
+        self._lock = threading.Lock()
+
+    def write(self, rel_path, data, content_digest=None):
+        status = changed_status(os.path.join(self.base_dir, rel_path), data, content_digest)
+        if status != SKIPPED:
+            with self._lock:
+                self.files[rel_path] = data
+                self._statuses[rel_path] = status
+        return status, None
+
+    @property
+    def changes(self):
+        """(status, rel_path) of every file that would change, by path"""
+        return [(self._statuses[path], path) for path in sorted(self._statuses)]
+
+    def commit(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+def _read_tree(root, directory):
+    """rel_path -> bytes of every file below root/directory, paths relative to root"""
+    files = {}
+    for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return files
+
+
+def bundle_digest(files):
+    """Content hash of a bundle: its sorted entry names and contents"""
+    h = hashlib.sha256()
+    for name in sorted(files):
+        data = files[name]
+        h.update(f"{name}\0{len(data)}\0".encode("utf-8"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _tar_gz(files):
+    """Reproducible .tar.gz of files: sorted entries, fixed metadata, no gzip timestamp"""
+    out = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=out, compresslevel=9, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tar:
+            for name in sorted(files):
+                info = tarfile.TarInfo(name)
+                info.size = len(files[name])
+                info.mtime = BUNDLE_MTIME
+                info.mode = BUNDLE_MODE
+                info.uid = info.gid = 0
+                info.uname = info.gname = ""
+                tar.addfile(info, io.BytesIO(files[name]))
+    return out.getvalue()
+
+
+def _zip(files):
+    """Reproducible .zip of files: sorted entries, fixed metadata"""
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for name in sorted(files):
+            info = zipfile.ZipInfo(name, date_time=time.gmtime(BUNDLE_MTIME)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3
+            info.external_attr = (0o100000 | BUNDLE_MODE) << 16
+            zf.writestr(info, files[name])
+    return out.getvalue()
+
+
+class BundleSink:
+    """Writes each environment directory as a reproducible archive under out_dir
+
+    Files of layers/<layer>/environments/<env>/ go into one bundle (any
+    other file into the bundle of its directory), named after the
+    directory and the hash of its content, e.g.
+    layers-compute-environments-dev-<hash>.tar.gz. Entries keep their
+    path relative to the base dir, so a bundle extracts in place.
+    Identical content always yields byte-identical bundles, and a bundle
+    already in out_dir is left alone. index.json maps each directory to
+    its current bundle.
+
+    Rendered files are staged on disk under out_dir until commit, which
+    builds the bundles one directory at a time, so memory does not grow
+    with the size of the fleet.
+    """
+
+    def __init__(self, out_dir, format="tar.gz"):
+        if format not in BUNDLE_FORMATS:
+            raise ValueError(f"unknown bundle format {format!r} (use {' or '.join(BUNDLE_FORMATS)})")
+        self.out_dir = out_dir
+        self.format = format
+        self.bundles = {}
+        self.reused = 0
+        self._staging = os.path.join(out_dir, f".staging-{os.getpid()}")
+
+    def write(self, rel_path, data, content_digest=None):
+        path = os.path.join(self._staging, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return CREATED, None
+
+    def _units(self):
+        """Yield (directory, files) of every bundle staged, by directory"""
+        for dirpath, dirnames, filenames in os.walk(self._staging):
+            dirnames.sort()
+            unit = os.path.relpath(dirpath, self._staging).replace(os.sep, "/")
+            if _ENVIRONMENT.match(unit):
+                # An environment's bundle holds its subdirectories too
+                dirnames.clear()
+                yield unit, _read_tree(self._staging, unit)
+            elif filenames:
+                yield unit, {(f"{unit}/{name}" if unit != "." else name): self._read(unit, name)
+                             for name in filenames}
+
+    def _read(self, unit, name):
+        with open(os.path.join(self._staging, unit, name), "rb") as f:
+            return f.read()
+
+    def commit(self):
+        archive = _zip if self.format == "zip" else _tar_gz
+        os.makedirs(self.out_dir, exist_ok=True)
+        for unit, files in self._units():
+            name = f"{unit.replace('/', '-')}-{bundle_digest(files)[:16]}.{self.format}"
+            path = os.path.join(self.out_dir, name)
+            if os.path.exists(path):
+                self.reused += 1
+            else:
+                with open(f"{path}.tmp", "wb") as f:
+                    f.write(archive(files))
+                os.replace(f"{path}.tmp", path)
+            self.bundles[unit] = name
+        shutil.rmtree(self._staging, ignore_errors=True)
+        self._save_index()
+
+    def _save_index(self):
+        path = os.path.join(self.out_dir, BUNDLE_INDEX)
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        index.update(self.bundles)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(f"{path}.tmp", path)
+
+    def abort(self):
+        shutil.rmtree(self._staging, ignore_errors=True)
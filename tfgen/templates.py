@@ -0,0 +1,279 @@
+"""
+On-disk templates, loaded lazily and compiled once
+
+Templates live under templates/<set>/<name>/<filename>.tmpl, e.g.
+templates/layers/dns/main.tf.tmpl is main.tf of the dns layer. A
+TemplateSet lists names from the directory tree without reading any
+file; a template is only read and compiled the first time it is used and
+then stays cached for the rest of the process (or until forget() drops it
+after an edit, see tfgen.watch), so generating one layer or module never
+pays for the others.
+
+Template syntax is deliberately small, since Terraform's own ${...}
+interpolation has to pass through untouched:
+
+    {{ name }}            value of name in the render context
+    {{ name|upper }}      same, through a filter (upper, lower, capitalize)
+    {{> fragment k=v }}   templates/fragments/<fragment>.tmpl rendered with
+                          k bound to the context value v (or to "literal")
+
+A fragment tag alone on its line replaces the whole line. Each template
+is compiled once into a Python function that joins its literal text with
+the looked-up values. Fragments are shared text such as the
+terraform/provider blocks and common_tags; each one is rendered once per
+distinct set of parameters and memoized, so thousands of files reuse the
+same rendered text.
+
+Templates of HCL files (.tf, .tfvars, .conf) are laid out like
+`terraform fmt` after rendering (tfgen/fmt.py), so substituted values of
+different lengths never leave the output misaligned.
+"""
+
+import functools
+import hashlib
+import os
+import re
+from collections.abc import Mapping
+
+from tfgen import fmt, hcl
+from tfgen.profile import span
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+FRAGMENTS = "fragments"
+SUFFIX = ".tmpl"
+
+FILTERS = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "capitalize": str.capitalize,
+}
+
+_TAG = re.compile(r"\{\{(>?)\s*(.*?)\s*\}\}")
+_PARAM = re.compile(r'(\w+)=(?:"([^"]*)"|(\w+))')
+
+
+class TemplateError(ValueError):
+    """A template could not be compiled or rendered"""
+
+
+# Per-process caches of template sources, compiled templates and directory
+# listings; forget() drops what a changed file invalidates
+_sources = {}
+_compiled = {}
+_listings = {}
+
+
+def load(path):
+    """Read a template file (cached per process)"""
+    source = _sources.get(path)
+    if source is None:
+        with span("load", template=path), open(path, encoding="utf-8", newline="") as f:
+            source = _sources[path] = f.read()
+    return source
+
+
+def compile_template(path, root=TEMPLATES_DIR):
+    """Compiled Template for path (cached per process)"""
+    template = _compiled.get((path, root))
+    if template is None:
+        source = load(path)
+        with span("compile", template=path):
+            template = _compiled[(path, root)] = Template(path, source, root)
+    return template
+
+
+def _listing(path):
+    """Entries of a template directory as (name, is_dir) (cached per process)"""
+    entries = _listings.get(path)
+    if entries is None:
+        entries = _listings[path] = sorted((entry.name, entry.is_dir()) for entry in os.scandir(path))
+    return entries
+
+
+def forget(paths):
+    """Drop everything cached from the template files or directories in paths
+
+    Only the changed files are read again. Every compiled template is
+    dropped, since any of them may include a changed fragment; compiling
+    is cheap next to reading.
+    """
+    for path in paths:
+        _sources.pop(path, None)
+        _listings.pop(path, None)
+        _listings.pop(os.path.dirname(path), None)
+    _compiled.clear()
+    render_fragment.cache_clear()
+
+
+def fragment(name, root=TEMPLATES_DIR):
+    """Compiled fragment templates/fragments/<name>.tmpl"""
+    return compile_template(os.path.join(root, FRAGMENTS, name + SUFFIX), root)
+
+
+@functools.lru_cache(maxsize=4096)
+def render_fragment(name, params, root=TEMPLATES_DIR):
+    """Rendered fragment, memoized per (fragment, parameters)"""
+    return fragment(name, root).render(dict(params))
+
+
+class Template:
+    """A template compiled into a Python function over its render context"""
+
+    def __init__(self, path, source, root=TEMPLATES_DIR):
+        self.path = path
+        self.root = root
+        self.variables = set()
+        self.fragments = set()
+        self.formatted = hcl.is_hcl(path.removesuffix(SUFFIX))
+        self._render = self._compile(source)
+
+    def __repr__(self):
+        return self._repr
+
+    @functools.cached_property
+    def _repr(self):
+        return f"<Template {self.name} {self.digest}>"
+
+    @functools.cached_property
+    def name(self):
+        """Path relative to the templates dir, e.g. layers/dns/main.tf.tmpl"""
+        return os.path.relpath(self.path, self.root)
+
+    def _compile(self, source):
+        exprs = []
+        pos = 0
+        for match in _TAG.finditer(source):
+            start, end = match.span()
+            if start > pos:
+                exprs.append(repr(source[pos:start]))
+            include, body = match.groups()
+            if include:
+                # A fragment tag alone on its line replaces the whole line
+                if (start == 0 or source[start - 1] == "\n") and source.startswith("\n", end):
+                    end += 1
+                exprs.append(self._include(body))
+            else:
+                exprs.append(self._variable(body))
+            pos = end
+        if pos < len(source):
+            exprs.append(repr(source[pos:]))
+
+        code = f"def _render(ctx):\n    return ''.join(({', '.join(exprs)},))\n"
+        namespace = {"FILTERS": FILTERS, "render_fragment": render_fragment, "root": self.root}
+        exec(compile(code, self.path, "exec"), namespace)
+        return namespace["_render"]
+
+    def _variable(self, body):
+        name, _, filter_name = body.partition("|")
+        name, filter_name = name.strip(), filter_name.strip()
+        if filter_name and filter_name not in FILTERS:
+            raise TemplateError(f"{self.path}: unknown filter '{filter_name}'")
+        self.variables.add(name)
+        if filter_name:
+            return f"FILTERS[{filter_name!r}](str(ctx[{name!r}]))"
+        return f"str(ctx[{name!r}])"
+
+    def _include(self, body):
+        name, _, args = body.partition(" ")
+        params = []
+        for key, literal, variable in sorted(_PARAM.findall(args)):
+            if variable:
+                self.variables.add(variable)
+                params.append(f"({key!r}, str(ctx[{variable!r}]))")
+            else:
+                params.append(repr((key, literal)))
+        self.fragments.add(name)
+        return f"render_fragment({name!r}, ({''.join(p + ', ' for p in params)}), root)"
+
+    @functools.cached_property
+    def digest(self):
+        """Digest of this template's source and every fragment it includes"""
+        h = hashlib.sha256(load(self.path).encode("utf-8"))
+        for name in sorted(self.fragments):
+            h.update(fragment(name, self.root).digest.encode("utf-8"))
+        if self.formatted:
+            h.update(f"fmt-v{fmt.VERSION}".encode("utf-8"))
+        return h.hexdigest()
+
+    @functools.cached_property
+    def sources(self):
+        """Paths of this template and every fragment it includes"""
+        paths = {self.path}
+        for name in self.fragments:
+            paths |= fragment(name, self.root).sources
+        return frozenset(paths)
+
+    def select(self, context):
+        """The subset of context this template actually reads"""
+        return {name: context[name] for name in sorted(self.variables) if name in context}
+
+    def render(self, context):
+        with span("template", template=self.name):
+            try:
+                text = self._render(context)
+            except KeyError as e:
+                raise TemplateError(f"{self.path}: {e} is not defined") from None
+            if not self.formatted:
+                return text
+            with span("format"):
+                return fmt.format_hcl(text)
+
+
+def render(template, context):
+    """Renderer for Targets built from a Template"""
+    return template.render(context)
+
+
+class TemplateDir(Mapping):
+    """Lazy mapping of filename -> compiled Template for one layer or module"""
+
+    def __init__(self, path, root=TEMPLATES_DIR):
+        self.path = path
+        self.root = root
+
+    @property
+    def _names(self):
+        return [name[: -len(SUFFIX)] for name, is_dir in _listing(self.path) if name.endswith(SUFFIX)]
+
+    def __getitem__(self, filename):
+        if filename not in self._names:
+            raise KeyError(filename)
+        return compile_template(os.path.join(self.path, filename + SUFFIX), self.root)
+
+    def __contains__(self, filename):
+        return filename in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+class TemplateSet(Mapping):
+    """Lazy mapping of name -> TemplateDir over templates/<set>/"""
+
+    def __init__(self, name, root=TEMPLATES_DIR):
+        self.path = os.path.join(root, name)
+        self.root = root
+        self._dirs = {}
+
+    @property
+    def _names(self):
+        return [name for name, is_dir in _listing(self.path) if is_dir]
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        if name not in self._dirs:
+            self._dirs[name] = TemplateDir(os.path.join(self.path, name), self.root)
+        return self._dirs[name]
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,161 @@
+"""
+Atomic, batched commit of generated output
+
+A Transaction stages every changed file in a sibling tree under the base
+dir (.tfgen-stage-XXXX/) and only moves it into layers/ and modules/ once
+the whole run has rendered successfully. A crash or Ctrl-C before that
+leaves the real tree untouched; the stale stage is removed by the next
+run.
+
+Committing flushes the staged data with a single filesystem sync and
+marks the stage with a COMMIT journal; the staged tree itself records
+what is left to move. Files are then moved into place directory by
+directory: a directory that does not exist yet is renamed into place in
+one go, otherwise its files are renamed one by one. Each target
+directory is fsynced once, after all of its renames, rather than
+fsyncing every file. If the process dies during this phase, the next run
+finds the journal and moves whatever is still staged.
+"""
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import shutil
+import tempfile
+
+from tfgen.profile import span
+from tfgen.writer import SKIPPED, changed_status
+
+STAGE_PREFIX = ".tfgen-stage-"
+TREE = "tree"
+JOURNAL = "COMMIT"
+OWNER = "PID"
+
+
+def _libc_syncfs():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return libc.syncfs
+    except (OSError, AttributeError, TypeError):
+        return None
+
+
+_syncfs = _libc_syncfs()
+
+
+def sync_filesystem(path):
+    """Flush all dirty data of the filesystem holding path in one call"""
+    if _syncfs is None:
+        os.sync()
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if _syncfs(fd) != 0:
+            os.sync()
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path):
+    """Persist the directory entries (renames) of path"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _move_into_place(base_dir, tree):
+    """Rename the staged tree into base_dir, directory by directory"""
+    touched = set()
+    for staged_dir, subdirs, files in os.walk(tree):
+        rel_dir = os.path.relpath(staged_dir, tree)
+        target_dir = os.path.normpath(os.path.join(base_dir, rel_dir))
+        if rel_dir != "." and not os.path.exists(target_dir):
+            parent = os.path.dirname(target_dir)
+            os.makedirs(parent, exist_ok=True)
+            os.replace(staged_dir, target_dir)
+            touched.add(parent)
+            subdirs[:] = []
+            continue
+        for name in files:
+            os.replace(os.path.join(staged_dir, name), os.path.join(target_dir, name))
+        if files:
+            touched.add(target_dir)
+
+    with span("fsync"):
+        for directory in sorted(touched):
+            fsync_dir(directory)
+
+
+def recover(base_dir):
+    """Roll forward journaled commits and drop abandoned stages"""
+    for stage in glob.glob(os.path.join(base_dir, STAGE_PREFIX + "*")):
+        if os.path.exists(os.path.join(stage, JOURNAL)):
+            _move_into_place(base_dir, os.path.join(stage, TREE))
+        else:
+            try:
+                with open(os.path.join(stage, OWNER)) as f:
+                    if _alive(int(f.read())):
+                        continue
+            except (FileNotFoundError, ValueError):
+                pass
+        shutil.rmtree(stage, ignore_errors=True)
+
+
+class Transaction:
+    """Stages changed files and commits them into base_dir atomically"""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        recover(base_dir)
+        self.stage = tempfile.mkdtemp(prefix=STAGE_PREFIX, dir=base_dir)
+        with open(os.path.join(self.stage, OWNER), "w") as f:
+            f.write(str(os.getpid()))
+        self.tree = os.path.join(self.stage, TREE)
+        self.dirty = False
+
+    def write(self, rel_path, data, content_digest):
+        """Stage rel_path if changed; return (status, path to stat it at)
+
+        A staged file keeps its inode, size and mtime when it is renamed
+        into place, so it can be stat'ed for the manifest before commit.
+        """
+        final = os.path.join(self.base_dir, rel_path)
+        status = changed_status(final, data, content_digest)
+        if status == SKIPPED:
+            return status, final
+        staged = os.path.join(self.tree, rel_path)
+        with span("mkdir"):
+            os.makedirs(os.path.dirname(staged), exist_ok=True)
+        with span("write"), open(staged, "wb") as f:
+            f.write(data)
+        self.dirty = True
+        return status, staged
+
+    def commit(self):
+        """Move every staged file into place and remove the stage"""
+        if self.dirty:
+            with span("fsync"):
+                sync_filesystem(self.stage)
+            open(os.path.join(self.stage, JOURNAL), "w").close()
+            with span("fsync"):
+                fsync_dir(self.stage)
+            _move_into_place(self.base_dir, self.tree)
+        shutil.rmtree(self.stage, ignore_errors=True)
+
+    def abort(self):
+        """Discard everything staged"""
+        shutil.rmtree(self.stage, ignore_errors=True)
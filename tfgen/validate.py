@@ -0,0 +1,146 @@
+"""
+HCL validation of rendered files, cached by content digest
+
+Every rendered .tf, .tfvars and backend.conf is parsed in process (see
+tfgen.hcl) before it is written, and the module calls in .tf files are
+checked against the module interface index (see tfgen.interface).
+Results are keyed by the digest of the file content (plus the index
+digest for .tf files), so a file is only checked again once its bytes
+change.
+
+Like the manifest, the cache is sharded by output directory and mirrors
+the generated tree, e.g. .tfgen-cache/hcl-v3/layers/dns/environments/prod.json
+holds the results of layers/dns/environments/prod/, and only a bounded
+number of shards is kept in memory. Each file keeps the result of its
+latest content only, so the cache is no larger than the generated tree.
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+from tfgen import hcl
+from tfgen.writer import digest
+
+CACHE_DIR = ".tfgen-cache"
+# Bump when the checks change what they accept, so cached results are dropped
+PARSER_VERSION = 3
+CACHED_SHARDS = 256
+
+
+class ValidationError(Exception):
+    """Rendered files are not valid HCL or call modules incorrectly"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} error(s) in generated files")
+        self.errors = errors
+
+
+class _Shard:
+    def __init__(self, path, results):
+        self.path = path
+        # File name -> [key, errors]
+        self.results = results
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                return cls(path, json.load(f))
+        except (FileNotFoundError, ValueError):
+            return cls(path, {})
+
+    def save(self):
+        if not self.dirty or self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.results, f, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class Validator:
+    """Checks rendered files and collects their errors, with a persistent cache
+
+    With a ModuleIndex, module calls in .tf files are checked against it.
+    Without a base dir results are only cached in memory.
+    """
+
+    def __init__(self, base_dir, index=None, cached_shards=CACHED_SHARDS):
+        self.index = index
+        self.root = os.path.join(base_dir, CACHE_DIR, f"hcl-v{PARSER_VERSION}") if base_dir is not None else None
+        self.cached_shards = cached_shards
+        self.errors = []
+        self._shards = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shard(self, rel_path):
+        """Shard holding rel_path's result; caller must hold the lock"""
+        directory, name = os.path.split(rel_path)
+        shard = self._shards.get(directory)
+        if shard is None:
+            if self.root is None:
+                shard = _Shard(None, {})
+            else:
+                shard = _Shard.load(os.path.join(self.root, f"{directory}.json"))
+            self._shards[directory] = shard
+            while len(self._shards) > self.cached_shards:
+                self._shards.popitem(last=False)[1].save()
+        else:
+            self._shards.move_to_end(directory)
+        return shard, name
+
+    def check(self, rel_path, data, content_digest):
+        """True if rel_path's rendered data is valid (or not HCL at all)"""
+        if not hcl.is_hcl(rel_path):
+            return True
+        key = content_digest
+        if self.index is not None and rel_path.endswith(".tf"):
+            key = digest(f"{content_digest}:{self.index.digest}".encode("utf-8"))
+        with self._lock:
+            shard, name = self._shard(rel_path)
+            cached = shard.results.get(name)
+        if cached is not None and cached[0] == key:
+            errors = cached[1]
+        else:
+            errors = self._check(data.decode("utf-8"), rel_path.endswith(".tf"))
+            with self._lock:
+                shard, name = self._shard(rel_path)
+                shard.results[name] = [key, errors]
+                shard.dirty = True
+        if not errors:
+            return True
+        with self._lock:
+            self.errors.extend(f"{rel_path}:{error}" for error in errors)
+        return False
+
+    def _check(self, text, module_calls):
+        """Error messages ("line:col: message") for one file's text"""
+        try:
+            body = hcl.parse(text)
+        except hcl.HCLError as e:
+            return [f"{e.line}:{e.col}: {e.message}"]
+        if not module_calls or self.index is None:
+            return []
+        source = hcl.Source(text, None)
+        return ["%d:%d: %s" % (*source.location(pos), message) for pos, message in self.index.check_calls(body)]
+
+    def save(self):
+        """Persist the results of files checked during this run"""
+        if self.index is not None:
+            self.index.save()
+        if self.root is None:
+            return
+        with self._lock:
+            for shard in self._shards.values():
+                shard.save()
+        # Caches of earlier parser versions are never read again
+        for path in glob.glob(os.path.join(os.path.dirname(self.root), "hcl-v*")):
+            if path != self.root:
+                shutil.rmtree(path, ignore_errors=True)
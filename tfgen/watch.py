@@ -0,0 +1,199 @@
+"""
+File watching for --watch
+
+A Watcher blocks until files under its watched directories (recursively)
+or one of its watched files change, and yields the set of changed paths.
+On Linux it is backed by inotify, through ctypes, so an edit is seen as
+soon as the editor closes the file; elsewhere, or when inotify is not
+available, directories are polled for mtime and size changes.
+
+Editors often save in several steps (write a temporary file, rename it
+over the original), so events are collected until the tree has been
+quiet for DEBOUNCE seconds and reported as one batch.
+"""
+
+import abc
+import ctypes
+import errno
+import os
+import select
+import struct
+import time
+
+# Seconds without events that end a batch of changes
+DEBOUNCE = 0.02
+# Seconds between scans of the polling watcher
+POLL_INTERVAL = 0.1
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ATTRIB
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+_EVENT = struct.Struct("iIII")
+
+
+class Watcher(abc.ABC):
+    """Base class: changes() yields debounced batches of changed paths"""
+
+    @abc.abstractmethod
+    def wait(self, timeout=None):
+        """Changed paths seen within timeout seconds (forever if None)"""
+
+    def changes(self):
+        """Yield a set of changed paths for every burst of edits"""
+        while True:
+            paths = self.wait()
+            while paths:
+                more = self.wait(DEBOUNCE)
+                if not more:
+                    break
+                paths |= more
+            if paths:
+                yield paths
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """Watcher on Linux inotify; raises OSError where it is unavailable"""
+
+    def __init__(self, directories=(), files=()):
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except (OSError, AttributeError):
+            raise OSError(errno.ENOSYS, "inotify is not available") from None
+        self._fd = init(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        self.trees = {os.path.abspath(directory) for directory in directories}
+        self.files = {os.path.abspath(path) for path in files if path}
+        try:
+            for tree in self.trees:
+                self._add_tree(tree)
+            # Files are watched through their directory, so a file replaced
+            # by a rename is still seen
+            for path in self.files:
+                self._add(os.path.dirname(path))
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, directory):
+        wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+        self._dirs[wd] = directory
+
+    def _add_tree(self, root):
+        for directory, _, _ in os.walk(root):
+            self._add(directory)
+
+    def _watched(self, path):
+        return path in self.files or any(path == tree or path.startswith(tree + os.sep) for tree in self.trees)
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: report every watched tree as changed
+                paths |= self.trees | self.files
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if not self._watched(path):
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+            paths.add(path)
+        return paths
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return set()
+            paths = self._read()
+            if paths or deadline is not None and time.monotonic() >= deadline:
+                return paths
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """Watcher that rescans its directories every POLL_INTERVAL seconds"""
+
+    def __init__(self, directories=(), files=(), interval=POLL_INTERVAL):
+        self.trees = [os.path.abspath(directory) for directory in directories]
+        self.files = [os.path.abspath(path) for path in files if path]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        """path -> (mtime_ns, size) of every watched file"""
+        snapshot = {}
+        for root in self.trees:
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    self._stat(os.path.join(directory, name), snapshot)
+        for path in self.files:
+            self._stat(path, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _stat(path, snapshot):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
+            snapshot = self._scan()
+            paths = {path for path in snapshot.keys() | self._snapshot.keys()
+                     if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if paths or deadline is not None and time.monotonic() >= deadline:
+                return paths
+
+
+def watcher(directories=(), files=()):
+    """An inotify watcher if the platform has inotify, else a polling one"""
+    try:
+        return InotifyWatcher(directories, files)
+    except OSError:
+        return PollingWatcher(directories, files)
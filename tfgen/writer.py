@@ -0,0 +1,108 @@
+"""
+Write layer that only touches files whose content actually changed
+
+Rewriting an identical file still bumps its mtime, which invalidates CI
+caches and makes terraform and editors rescan the tree. write_if_changed
+compares a digest of the rendered content with the file on disk and
+leaves identical files alone.
+"""
+
+import hashlib
+import os
+import threading
+
+from tfgen.profile import span
+
+CREATED = "created"
+WRITTEN = "written"
+SKIPPED = "skipped"
+CACHED = "cached"
+INVALID = "invalid"
+
+
+def digest(data):
+    """Content digest used to compare rendered output with disk"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def changed_status(path, data, content_digest=None):
+    """CREATED, WRITTEN or SKIPPED for writing data to path"""
+    with span("compare"):
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            return CREATED
+        if size == len(data):
+            with open(path, "rb") as f:
+                if digest(f.read()) == (content_digest or digest(data)):
+                    return SKIPPED
+        return WRITTEN
+
+
+def write_if_changed(path, content, content_digest=None):
+    """Write content (str or bytes) to path unless the file already holds it"""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    status = changed_status(path, data, content_digest)
+    if status == SKIPPED:
+        return status
+    if status == CREATED:
+        with span("mkdir"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+    with span("write"), open(path, "wb") as f:
+        f.write(data)
+    return status
+
+
+class InPlaceWriter:
+    """Writes each changed file directly into the base dir"""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def write(self, rel_path, data, content_digest):
+        """Write rel_path if changed; return (status, path to stat it at)"""
+        path = os.path.join(self.base_dir, rel_path)
+        return write_if_changed(path, data, content_digest), path
+
+    def commit(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+class WriteStats:
+    """Thread-safe counters of created, written, skipped and cached files
+
+    Skipped files were rendered but matched the disk; cached files were not
+    rendered at all because the manifest showed their inputs unchanged;
+    invalid files were rendered but failed validation and were not written.
+    Render and write times are summed over all workers.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.written = 0
+        self.skipped = 0
+        self.cached = 0
+        self.invalid = 0
+        self.render_seconds = 0.0
+        self.write_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, status, render_seconds=0.0, write_seconds=0.0):
+        with self._lock:
+            setattr(self, status, getattr(self, status) + 1)
+            self.render_seconds += render_seconds
+            self.write_seconds += write_seconds
+
+    @property
+    def total(self):
+        return self.created + self.written + self.skipped + self.cached + self.invalid
+
+    def __str__(self):
+        summary = (
+            f"{self.created} created, {self.written} written, "
+            f"{self.skipped} skipped, {self.cached} cached"
+        )
+        return f"{summary}, {self.invalid} invalid" if self.invalid else summary